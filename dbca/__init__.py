@@ -0,0 +1,51 @@
+"""
+Análisis de Diseños en Bloques Completamente al Azar (DBCA) para ensayos de quinua
+
+Módulos:
+- anova: tablas ANOVA Tipo II en forma cerrada o por QR sobre las celdas
+- cache: cache LRU (memoria/disco) de disposiciones de campo
+- comparaciones: Tukey, LSD y Bonferroni con letras de agrupamiento
+- permutacion: ANOVA por permutaciones dentro de bloques
+- supuestos: normalidad, homogeneidad de varianzas y aditividad
+- lote: análisis por lotes de ensayos en un pool de procesos
+- simulacion: ensayos simulados vectorizados (de 60 a 10^8 parcelas)
+- traduccion: traducción en streaming de columnas y niveles (varios idiomas)
+- potencia: potencia Monte Carlo por término para diseños candidatos
+- disposicion: disposiciones de campo A/D-óptimas con parcelas aleatorizadas
+- analisis, boxplots, normativa: reportes (uno por función de sección)
+- datos: cargador con cache columnar, alias del esquema y factores ordenados
+- cli: `python -m dbca <subcomando>`
+
+Los nombres públicos se importan al primer uso (`dbca.anova_dbca` carga sólo
+dbca.anova), así que `import dbca` no carga scipy.stats ni matplotlib.
+"""
+
+from importlib import import_module
+
+_EXPORTADOS = {
+    'anova_dbca': 'anova',
+    'anova_dbca_multiple': 'anova',
+    'construir_diseno': 'anova',
+    'formula_dbca': 'anova',
+    'CacheDisenos': 'cache',
+    'comparaciones_multiples': 'comparaciones',
+    'anova_permutacion': 'permutacion',
+    'diagnosticar_supuestos': 'supuestos',
+    'prueba_aditividad': 'supuestos',
+    'ejecutar_lote': 'lote',
+    'leer_datos': 'datos',
+    'como_factores': 'datos',
+    'resolver_esquema': 'datos',
+    'generar_ensayo': 'simulacion',
+    'traducir_datos': 'traduccion',
+    'potencia_disenos': 'potencia',
+    'optimizar_disposicion': 'disposicion',
+}
+
+__all__ = sorted(_EXPORTADOS)
+
+
+def __getattr__(nombre):
+    if nombre not in _EXPORTADOS:
+        raise AttributeError(f"module 'dbca' has no attribute {nombre!r}")
+    return getattr(import_module(f'.{_EXPORTADOS[nombre]}', __name__), nombre)
@@ -0,0 +1,484 @@
+"""
+Análisis de Diseño en Bloques Completamente al Azar (DBCA) para datos de Quinua
+Diseño Optimizado: 5 Réplicas, 60 Unidades Experimentales
+Autor: Análisis Experimental
+Fecha: 2025-12-10
+
+Una función por sección del reporte. Las secciones de texto sólo dependen de
+pandas/numpy/scipy; matplotlib y seaborn se importan dentro de las funciones
+de figuras, de modo que un reporte sin gráficos no paga ese costo de import.
+Las figuras se renderizan sin pantalla y en paralelo con dbca.figuras.
+Las medias, conteos, describe() y los datos de cada caja o violín salen de un
+único IndiceGrupos del dataset (dbca.grupos), sin filtrar el DataFrame por nivel.
+Los boxplots se dibujan con bxp desde resúmenes por grupo (dbca.cajas), con un
+número acotado de atípicos por caja, y los violines con Axes.violin desde
+densidades KDE binned por FFT (dbca.violines).
+"""
+
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .anova import anova_dbca, anova_dbca_multiple
+from .cache import CacheDisenos
+from .cajas import MAX_ATIPICOS, dibujar_cajas, resumenes_grupos
+from .comparaciones import comparaciones_multiples
+from .datos import leer_datos
+from .figuras import CacheFiguras, Figura, imprimir_tiempos, renderizar_figuras
+from .grupos import IndiceGrupos
+from .permutacion import anova_permutacion
+from .supuestos import diagnosticar_supuestos, prueba_aditividad
+from .violines import violines_grupos
+
+FACTORES = ['Variedad', 'Fertilizante', 'Riego']
+RESPUESTAS = ['Rendimiento_kg', 'Dias_cosecha', 'Calidad_grano', 'Densidad_plants_m2']
+COVARIABLES = ['Altitud_m', 'Precipitacion_mm', 'pH_Suelo']
+DATOS = 'quinua_5replicas.csv'
+
+# Paneles de interacción de la figura de boxplots: (factor[es], posición[, colores])
+_INTERACCIONES_BLOQUE = [('Variedad', 5), ('Fertilizante', 6), ('Riego', 7)]
+_INTERACCIONES_FACTORES = [
+    ('Variedad', 'Fertilizante', 8, ['lightcoral', 'lightblue', 'lightgreen']),
+    ('Variedad', 'Riego', 9, ['lightblue', 'lightgreen', 'lightyellow', 'lightcoral']),
+    ('Fertilizante', 'Riego', 10, ['lightblue', 'lightgreen', 'lightyellow', 'lightcoral',
+                                   'lightpink', 'lightgray']),
+]
+
+
+def _titulo(texto, linea='='):
+    print(f"\n\n{texto}")
+    print(linea * 80)
+
+
+# ============================================================================
+# 1. CARGA Y PREPARACIÓN DE DATOS
+# ============================================================================
+
+def cargar_datos(ruta=DATOS):
+    """Carga el dataset con los factores ordenados del esquema e imprime la cabecera del reporte"""
+    print("="*80)
+    print("ANÁLISIS DE DISEÑO EN BLOQUES COMPLETAMENTE AL AZAR (DBCA)")
+    print("Dataset: Quinua con 5 Réplicas (60 Unidades Experimentales)")
+    print("="*80)
+
+    df, ruta = leer_datos(ruta, columnas=RESPUESTAS + COVARIABLES)
+    print(f"\n✓ Datos cargados: {ruta} (5 réplicas, 60 UE)")
+    return df
+
+
+def seccion_estructura(df, indice):
+    """1. Estructura de los datos y características de cada bloque"""
+    print("\n1. ESTRUCTURA DE LOS DATOS")
+    print("-"*80)
+    print(f"Total de observaciones: {len(df)}")
+    print(f"\nPrimeras filas:")
+    print(df.head(10))
+
+    print(f"\nDistribución de observaciones por Bloque:")
+    print(indice.conteos('Bloque'))
+
+    print(f"\nCaracterísticas de cada Bloque:")
+    print(indice.medias(COVARIABLES, 'Bloque'))
+
+
+# ============================================================================
+# 2-4. ANÁLISIS DBCA POR FACTOR (CONTROLANDO POR BLOQUES)
+# ============================================================================
+
+def seccion_factor(df, indice, factor, numero, tukey=True, cache=None):
+    """
+    ANOVA DBCA de un factor con bloques y, si `tukey`, comparaciones de Tukey
+    con el CME y GL del modelo con bloques. Devuelve el ResultadoDBCA.
+    """
+    _titulo(f"{numero}. ANÁLISIS DBCA: EFECTO DE {factor.upper()} EN RENDIMIENTO")
+
+    print(f"\nRendimiento medio por {factor} y Bloque:")
+    print(indice.medias('Rendimiento_kg', [factor, 'Bloque']).unstack())
+
+    modelo = anova_dbca(df, 'Rendimiento_kg', [factor], cache=cache)
+    print(f"\nTabla ANOVA - DBCA ({factor}):")
+    print(modelo.tabla)
+
+    if tukey:
+        resultado = comparaciones_multiples(df, 'Rendimiento_kg', factor, modelo,
+                                            metodo='tukey', alpha=0.05)
+        print(f"\nPrueba de Tukey (Comparaciones múltiples - {factor}):")
+        print(resultado.pares.round(4).to_string(index=False))
+        print("\nGrupos (medias con la misma letra no difieren):")
+        print(resultado.grupos.round(4))
+    return modelo
+
+
+# ============================================================================
+# 5. ANÁLISIS DBCA - MODELO FACTORIAL COMPLETO
+# ============================================================================
+
+def seccion_factorial(df, respuestas=RESPUESTAS, cache=None):
+    """
+    Modelo factorial con bloques: Y ~ C(Bloque) + C(Variedad) * C(Fertilizante) * C(Riego)
+    para todas las `respuestas` con una única factorización del diseño.
+    Devuelve el diccionario respuesta → ResultadoDBCA.
+    """
+    _titulo("5. ANÁLISIS DBCA: MODELO FACTORIAL COMPLETO")
+
+    modelos = anova_dbca_multiple(df, respuestas, FACTORES, cache=cache)
+    modelo = modelos['Rendimiento_kg']
+
+    print("\nTabla ANOVA - DBCA Factorial:")
+    print(modelo.tabla)
+
+    print("\nResumen del modelo:")
+    print(f"  Observaciones: {len(df)}")
+    print(f"  GL residual: {modelo.gl_residual}")
+    print(f"  CME (cuadrado medio del error): {modelo.cme:.6f}")
+    print(f"  R²: {modelo.rsquared:.4f}  |  R² ajustado: {modelo.rsquared_adj:.4f}")
+    print(f"  Método de cálculo: {modelo.metodo}")
+
+    print("\nP-valores del modelo factorial para todas las variables respuesta:")
+    tabla_p = pd.DataFrame({r: m.tabla['PR(>F)'] for r, m in modelos.items()})
+    print(tabla_p.drop(index='Residual').round(4).to_string())
+    return modelos
+
+
+# ============================================================================
+# 6. EVALUACIÓN DEL EFECTO DE BLOQUES
+# ============================================================================
+
+def seccion_bloques(indice, modelo):
+    """Estadísticas por bloque y significancia del efecto de bloques en `modelo`"""
+    _titulo("6. EVALUACIÓN DEL EFECTO DE BLOQUES")
+
+    print("\nEstadísticas de Rendimiento por Bloque:")
+    print(indice.describir('Rendimiento_kg', 'Bloque'))
+
+    print("\nCaracterísticas ambientales por Bloque:")
+    print(indice.medias(COVARIABLES + ['Rendimiento_kg'], 'Bloque'))
+
+    p_valor = modelo.tabla.loc['C(Bloque)', 'PR(>F)']
+    print(f"\nSignificancia del efecto de Bloques:")
+    print(f"  p-valor: {p_valor:.4f}")
+    print(f"  Conclusión: {'Bloques tienen efecto significativo (p < 0.05)' if p_valor < 0.05 else 'Bloques NO tienen efecto significativo (p > 0.05)'}")
+
+
+# ============================================================================
+# 7. VERIFICACIÓN DE SUPUESTOS
+# ============================================================================
+
+def seccion_supuestos(df, modelos, cache=None):
+    """
+    Normalidad, homogeneidad de varianzas y aditividad para todas las
+    respuestas de `modelos`; ANOVA por permutaciones si el rendimiento no
+    tiene residuos normales. Devuelve el ResultadoSupuestos.
+    """
+    _titulo("7. VERIFICACIÓN DE SUPUESTOS DEL ANOVA")
+
+    diagnostico = diagnosticar_supuestos(df, list(modelos), FACTORES, modelos=modelos)
+    pruebas = diagnostico.pruebas.set_index(['respuesta', 'prueba'])
+
+    stat_shapiro, p_shapiro = pruebas.loc[('Rendimiento_kg', 'shapiro'), ['estadistico', 'p_valor']]
+    print(f"\nTest de Normalidad (Shapiro-Wilk):")
+    print(f"  Estadístico: {stat_shapiro:.4f}")
+    print(f"  p-valor: {p_shapiro:.4f}")
+    print(f"  Conclusión: {'Residuos normales (p > 0.05)' if p_shapiro > 0.05 else 'Residuos NO normales (p < 0.05)'}")
+
+    # Alternativa libre de distribución si los residuos no son normales
+    if p_shapiro <= 0.05:
+        anova_perm = anova_permutacion(df, 'Rendimiento_kg', FACTORES,
+                                       n_permutaciones=9999, semilla=42, cache=cache)
+        print("\nANOVA por permutaciones (9999 permutaciones dentro de cada Bloque):")
+        print(anova_perm)
+
+    # Levene centrado en la mediana (Brown-Forsythe), por Tratamiento
+    stat_levene, p_levene = pruebas.loc[('Rendimiento_kg', 'brown_forsythe'), ['estadistico', 'p_valor']]
+    print(f"\nTest de Homogeneidad de Varianzas (Levene):")
+    print(f"  Estadístico: {stat_levene:.4f}")
+    print(f"  p-valor: {p_levene:.4f}")
+    print(f"  Conclusión: {'Varianzas homogéneas (p > 0.05)' if p_levene > 0.05 else 'Varianzas NO homogéneas (p < 0.05)'}")
+
+    print("\nSupuestos para todas las variables respuesta (p-valores):")
+    print(diagnostico.pruebas.pivot(index='respuesta', columns='prueba', values='p_valor').round(4).to_string())
+    print("\nResumen de residuos:")
+    print(diagnostico.residuos.round(4).to_string())
+
+    # No aditividad de Tukey (1 gl) e interacción Bloque × Tratamiento con
+    # réplicas, calculados desde medias de celda y marginales (sin modelo saturado)
+    aditividad = prueba_aditividad(df, 'Rendimiento_kg', FACTORES)
+    p_tukey_1gl = aditividad.loc['no_aditividad', 'PR(>F)']
+    print(f"\nTest de No Aditividad de Tukey (1 gl):")
+    print(f"  F: {aditividad.loc['no_aditividad', 'F']:.4f}")
+    print(f"  p-valor: {p_tukey_1gl:.4f}")
+    print(f"  Conclusión: {'Modelo aditivo apropiado (p > 0.05)' if p_tukey_1gl > 0.05 else 'Posible falta de aditividad (p < 0.05)'}")
+
+    p_interaccion = aditividad.loc['interaccion', 'PR(>F)']
+    print(f"\nTest de Aditividad (Interacción Bloque × Tratamiento):")
+    print(f"  p-valor: {p_interaccion:.4f}")
+    print(f"  Conclusión: {'Modelo aditivo apropiado (p > 0.05)' if p_interaccion > 0.05 else 'Posible falta de aditividad (p < 0.05)'}")
+    return diagnostico
+
+
+# ============================================================================
+# 8. BOXPLOTS DETALLADOS
+# ============================================================================
+
+def _agregar_medias(ax, resumenes, positions):
+    """Agrega puntos de media a un boxplot"""
+    means = [r['mean'] for r in resumenes]
+    ax.plot(positions, means, 'D', color='red', markersize=8,
+            markeredgecolor='darkred', markeredgewidth=1.5,
+            label='Media', zorder=3)
+
+
+def _configurar_estilo():
+    """Estilo común de las figuras; cada figura lo fija porque puede dibujarse en otro proceso"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.style.use('seaborn-v0_8-darkgrid')
+    sns.set_palette("husl")
+
+
+def _estilo(ax, titulo, xlabel, rotacion=None, tamano=8):
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Rendimiento (kg)')
+    if rotacion is not None:
+        ax.tick_params(axis='x', rotation=rotacion, labelsize=tamano)
+    ax.grid(True, alpha=0.3)
+
+
+def figura_boxplots(indice, max_atipicos=MAX_ATIPICOS):
+    """
+    Figura 3 × 4 con boxplots por factor, por interacciones y violin plot por
+    bloque. Las cajas se dibujan con bxp desde resúmenes exactos, con a lo sumo
+    `max_atipicos` puntos atípicos por caja.
+    """
+    import matplotlib.pyplot as plt
+
+    _configurar_estilo()
+    fig = plt.figure(figsize=(20, 16))
+
+    # 8.1-8.4 Rendimiento por Bloque y por cada factor
+    colores = ['lightblue', 'lightgreen', 'lightyellow', 'lightcoral']
+    for i, col in enumerate(['Bloque'] + FACTORES):
+        ax = plt.subplot(3, 4, i + 1)
+        resumenes = resumenes_grupos(indice, 'Rendimiento_kg', col, max_atipicos=max_atipicos)
+        dibujar_cajas(ax, resumenes, colores=[colores[i]], alpha=0.7)
+        _agregar_medias(ax, resumenes, range(1, len(resumenes) + 1))
+        _estilo(ax, f'Rendimiento por {col}', col)
+        ax.legend()
+
+    # 8.5-8.7 Interacción de cada factor con Bloque
+    for factor, posicion in _INTERACCIONES_BLOQUE:
+        ax = plt.subplot(3, 4, posicion)
+        resumenes = resumenes_grupos(indice, 'Rendimiento_kg', [factor, 'Bloque'],
+                                     max_atipicos=max_atipicos, separador='\n')
+        dibujar_cajas(ax, resumenes, colores=['lightblue', 'lightgreen', 'lightyellow'], alpha=0.7)
+        _estilo(ax, f'Interacción {factor} × Bloque', f'{factor} - Bloque', rotacion=45)
+
+    # 8.8-8.10 Interacciones entre factores
+    for f1, f2, posicion, paleta in _INTERACCIONES_FACTORES:
+        ax = plt.subplot(3, 4, posicion)
+        resumenes = resumenes_grupos(indice, 'Rendimiento_kg', [f1, f2], max_atipicos=max_atipicos)
+        dibujar_cajas(ax, resumenes, colores=paleta, alpha=0.7)
+        _estilo(ax, f'Interacción {f1} × {f2}', f'{f1} - {f2}', rotacion=45)
+
+    # 8.11 Todos los Tratamientos
+    ax = plt.subplot(3, 4, 11)
+    resumenes = resumenes_grupos(indice, 'Rendimiento_kg', 'Tratamiento', max_atipicos=max_atipicos)
+    dibujar_cajas(ax, resumenes, colores=plt.cm.Set3(np.linspace(0, 1, len(resumenes))), alpha=0.7)
+    _estilo(ax, 'Rendimiento por Tratamiento Completo', 'Tratamiento', rotacion=90, tamano=7)
+
+    # 8.12 Violin Plot: Distribución por Bloque
+    ax = plt.subplot(3, 4, 12)
+    bloques_orden, data = violines_grupos(indice, 'Rendimiento_kg', 'Bloque')
+    parts = ax.violin(data, positions=range(1, len(data) + 1), showmeans=True, showmedians=True)
+    for i, pc in enumerate(parts['bodies']):
+        pc.set_facecolor(['lightblue', 'lightgreen', 'lightyellow'][i % 3])
+        pc.set_alpha(0.7)
+    ax.set_xticks(range(1, len(data) + 1))
+    ax.set_xticklabels(list(bloques_orden))
+    _estilo(ax, 'Distribución por Bloque (Violin Plot)', 'Bloque')
+
+    plt.tight_layout()
+    return fig
+
+
+# ============================================================================
+# 9. VISUALIZACIONES DE DIAGNÓSTICO
+# ============================================================================
+
+def figura_diagnostico(indice, modelo, max_atipicos=MAX_ATIPICOS):
+    """Figura 3 × 4 de medias por bloque, heatmaps, interacción y residuos de `modelo`"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from scipy import stats
+
+    _configurar_estilo()
+    residuos, valores_ajustados = modelo.residuos, modelo.ajustados
+    bloques = indice.niveles('Bloque')
+
+    fig = plt.figure(figsize=(18, 14))
+
+    # 9.1 Rendimiento por Bloque
+    ax1 = plt.subplot(3, 4, 1)
+    ax1.bxp(resumenes_grupos(indice, 'Rendimiento_kg', 'Bloque', max_atipicos=max_atipicos))
+    plt.title('Rendimiento por Bloque')
+    plt.xlabel('Bloque')
+    plt.ylabel('Rendimiento (kg)')
+
+    # 9.2-9.4 Rendimiento medio por factor (una línea por bloque)
+    for posicion, factor in enumerate(FACTORES, start=2):
+        plt.subplot(3, 4, posicion)
+        medias_bloque = indice.medias('Rendimiento_kg', ['Bloque', factor])
+        for bloque in bloques:
+            medias = medias_bloque.loc[bloque]
+            plt.plot(medias.index, medias.values, marker='o', label=bloque, linewidth=2)
+        plt.title(f'Rendimiento por {factor} (por Bloque)')
+        plt.xlabel(factor)
+        plt.ylabel('Rendimiento medio (kg)')
+        plt.legend(title='Bloque')
+        plt.grid(True, alpha=0.3)
+
+    # 9.5-9.7 Heatmaps factor × Bloque
+    for posicion, factor, cmap in [(5, 'Variedad', 'YlOrRd'), (6, 'Fertilizante', 'YlGnBu'),
+                                   (7, 'Riego', 'PuBuGn')]:
+        ax = plt.subplot(3, 4, posicion)
+        pivot = indice.medias('Rendimiento_kg', [factor, 'Bloque']).unstack()
+        sns.heatmap(pivot, annot=True, fmt='.3f', cmap=cmap, ax=ax)
+        plt.title(f'Heatmap: {factor} × Bloque')
+
+    # 9.8 Interacción Variedad × Fertilizante
+    ax8 = plt.subplot(3, 4, 8)
+    medias_vf = indice.medias('Rendimiento_kg', ['Variedad', 'Fertilizante']).unstack()
+    medias_vf.plot(ax=ax8, marker='o', linewidth=2)
+    plt.title('Interacción Variedad × Fertilizante')
+    plt.xlabel('Variedad')
+    plt.ylabel('Rendimiento medio (kg)')
+    plt.legend(title='Fertilizante')
+    plt.grid(True, alpha=0.3)
+
+    # 9.9 Q-Q Plot
+    ax9 = plt.subplot(3, 4, 9)
+    stats.probplot(residuos, dist="norm", plot=ax9)
+    plt.title('Q-Q Plot (Normalidad)')
+    plt.grid(True, alpha=0.3)
+
+    # 9.10 Residuos vs Valores Ajustados
+    plt.subplot(3, 4, 10)
+    plt.scatter(valores_ajustados, residuos, alpha=0.6)
+    plt.axhline(y=0, color='r', linestyle='--', linewidth=2)
+    plt.title('Residuos vs Valores Ajustados')
+    plt.xlabel('Valores Ajustados')
+    plt.ylabel('Residuos')
+    plt.grid(True, alpha=0.3)
+
+    # 9.11 Residuos por Bloque
+    ax11 = plt.subplot(3, 4, 11)
+    ax11.bxp(resumenes_grupos(indice, residuos.to_numpy(), 'Bloque', max_atipicos=max_atipicos))
+    plt.title('Residuos por Bloque')
+    plt.xlabel('Bloque')
+    plt.ylabel('Residuos')
+
+    # 9.12 Histograma de residuos
+    plt.subplot(3, 4, 12)
+    plt.hist(residuos, bins=20, edgecolor='black', alpha=0.7)
+    plt.title('Histograma de Residuos')
+    plt.xlabel('Residuos')
+    plt.ylabel('Frecuencia')
+    plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def seccion_figuras(indice, modelo, procesos=None, mostrar=False, cache=None):
+    """
+    8-9. Boxplots detallados y visualizaciones de diagnóstico, renderizadas
+    en paralelo sin pantalla (o en pantalla con `mostrar`). Con `cache`
+    (CacheFiguras) no se vuelven a dibujar si los datos no cambiaron.
+    Devuelve la tabla de tiempos por figura.
+    """
+    _titulo("8-9. GENERANDO BOXPLOTS Y VISUALIZACIONES DE DIAGNÓSTICO...", '-')
+    # Ambas figuras (y el modelo) dependen sólo del rendimiento, los bloques y los factores
+    insumos = (indice.df[['Bloque'] + FACTORES + ['Rendimiento_kg']],)
+    figuras = [
+        Figura('boxplots', figura_boxplots, (indice,), 'DBCA_boxplots_python.png', insumos=insumos),
+        Figura('diagnostico', figura_diagnostico, (indice, modelo), 'DBCA_analisis_quinua.png',
+               insumos=insumos),
+    ]
+    inicio = time.perf_counter()
+    tiempos = renderizar_figuras(figuras, procesos=procesos, mostrar=mostrar, cache=cache)
+    print(f"✓ Boxplots guardados en: {tiempos.loc['boxplots', 'archivo']}")
+    print(f"✓ Gráficos guardados en: {tiempos.loc['diagnostico', 'archivo']}")
+    imprimir_tiempos(tiempos, time.perf_counter() - inicio)
+    return tiempos
+
+
+# ============================================================================
+# 10. RESUMEN DE RESULTADOS
+# ============================================================================
+
+def seccion_resumen(modelo):
+    """Resumen de efectos de bloque, principales e interacciones del modelo factorial"""
+    tabla = modelo.tabla
+    _titulo("10. RESUMEN DE RESULTADOS - DBCA")
+
+    print("\nEfecto de Bloques:")
+    print(f"  p-valor: {tabla.loc['C(Bloque)', 'PR(>F)']:.4f}")
+    print(f"  Suma de cuadrados: {tabla.loc['C(Bloque)', 'sum_sq']:.4f}")
+
+    print("\nEfectos principales (p-valores):")
+    for factor in FACTORES:
+        print(f"  - {factor}: p = {tabla.loc[f'C({factor})', 'PR(>F)']:.4f}")
+
+    print("\nInteracciones (p-valores):")
+    for termino in tabla.index:
+        if ':' in termino:
+            nombre = ' × '.join(t[2:-1] for t in termino.split(':'))
+            print(f"  - {nombre}: p = {tabla.loc[termino, 'PR(>F)']:.4f}")
+
+    print("\nBondad de ajuste:")
+    print(f"  R² del modelo: {modelo.rsquared:.4f}")
+    print(f"  R² ajustado: {modelo.rsquared_adj:.4f}")
+
+
+def ejecutar_analisis(datos=DATOS, graficos=True, mostrar=False, directorio_cache='cache_dbca',
+                      procesos=None):
+    """
+    Reporte completo (secciones 1-10). Con `graficos=False` no se importan
+    matplotlib ni seaborn; si no, las figuras se renderizan sin pantalla en
+    hasta `procesos` procesos (o se muestran con `mostrar`) y, con
+    `directorio_cache`, las figuras sin cambios se copian de su subdirectorio
+    'figuras'. Devuelve el diccionario de modelos factoriales.
+    """
+    warnings.filterwarnings('ignore')
+    # Cache de diseños: reutiliza matrices y factorizaciones entre ejecuciones
+    # mientras la disposición de campo (bloques y factores) no cambie
+    cache = CacheDisenos(directorio=directorio_cache or None)
+
+    df = cargar_datos(datos)
+    indice = IndiceGrupos(df)
+    seccion_estructura(df, indice)
+    seccion_factor(df, indice, 'Variedad', 2, tukey=False, cache=cache)
+    seccion_factor(df, indice, 'Fertilizante', 3, cache=cache)
+    seccion_factor(df, indice, 'Riego', 4, cache=cache)
+    modelos = seccion_factorial(df, cache=cache)
+    modelo = modelos['Rendimiento_kg']
+    seccion_bloques(indice, modelo)
+    seccion_supuestos(df, modelos, cache=cache)
+    if graficos:
+        cache_figuras = CacheFiguras(os.path.join(directorio_cache, 'figuras')) if directorio_cache else None
+        seccion_figuras(indice, modelo, procesos=procesos, mostrar=mostrar, cache=cache_figuras)
+    seccion_resumen(modelo)
+
+    print("\n" + "="*80)
+    print("ANÁLISIS COMPLETADO")
+    print("="*80)
+
+    if graficos and mostrar:
+        import matplotlib.pyplot as plt
+        plt.show()
+    return modelos
@@ -0,0 +1,318 @@
+"""
+Motor ANOVA para Diseños en Bloques Completamente al Azar (DBCA)
+Calcula tablas ANOVA Tipo II (bloque + efectos factoriales) a partir de
+estadísticos suficientes por celda (n, media y suma de cuadrados intra-celda),
+obtenidos con una sola agrupación de los datos.
+
+- Diseño ortogonal (tratamientos balanceados y frecuencias bloque × tratamiento
+  proporcionales, p. ej. 2/2/1 réplicas por bloque): sumas de cuadrados en
+  forma cerrada a partir de medias marginales.
+- Diseño desbalanceado: mínimos cuadrados ponderados sobre las celdas mediante
+  descomposición QR con pivoteo (nunca sobre las N parcelas).
+
+Varias variables respuesta se resuelven juntas (anova_dbca_multiple): el diseño
+se factoriza una vez y cada respuesta es un lado derecho adicional.
+
+La disposición de campo (DisenoDBCA) depende sólo de las columnas de factores,
+por lo que puede reutilizarse entre análisis mediante dbca.cache.CacheDisenos.
+
+Las tablas usan el mismo formato que statsmodels.anova_lm(typ=2):
+índices 'C(Bloque)', 'C(Variedad):C(Riego)', ..., 'Residual' y columnas
+'sum_sq', 'df', 'F', 'PR(>F)'.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import qr
+from scipy.special import fdtrc
+
+COLUMNAS_ANOVA = ['sum_sq', 'df', 'F', 'PR(>F)']
+
+
+@dataclass
+class ResultadoDBCA:
+    """Resultado de un ajuste DBCA (equivalente a ols(...).fit() + anova_lm)"""
+    tabla: pd.DataFrame
+    ajustados: pd.Series
+    residuos: pd.Series
+    cme: float
+    gl_residual: int
+    rsquared: float
+    rsquared_adj: float
+    metodo: str
+
+
+@dataclass
+class DisenoDBCA:
+    """
+    Disposición de campo de un modelo DBCA: celdas observadas, asignación
+    fila → celda, matriz de diseño por celda con su mapa término → columnas
+    y factorizaciones QR de los submodelos Tipo II ya calculadas (LRU de a lo
+    sumo `max_factorizaciones`: cada patrón nuevo de n por celda agrega
+    entradas, y el diseño vive en CacheDisenos durante todo un lote).
+    """
+    bloque: object
+    factores: list
+    terminos: list
+    indice: pd.MultiIndex
+    codigos: np.ndarray
+    X: np.ndarray
+    columnas_termino: dict
+    factorizaciones: OrderedDict = field(default_factory=OrderedDict)
+    modificado: bool = True
+    max_factorizaciones: int = 128
+
+    @property
+    def todos_terminos(self):
+        return ([(self.bloque,)] if self.bloque is not None else []) + list(self.terminos)
+
+    def factorizar(self, n, incluidos):
+        """Base ortonormal (Q reducida al rango) del submodelo ponderado por n"""
+        clave = (n.tobytes(), tuple(incluidos))
+        if clave in self.factorizaciones:
+            self.factorizaciones.move_to_end(clave)
+        else:
+            columnas = [np.arange(1)] + [np.arange(*self.columnas_termino[t]) for t in incluidos]
+            Xw = self.X[:, np.concatenate(columnas)] * np.sqrt(n)[:, None]
+            Q, R, _ = qr(Xw, mode='economic', pivoting=True)
+            diag = np.abs(np.diag(R))
+            tol = diag.max() * max(Xw.shape) * np.finfo(float).eps if diag.size else 0.0
+            self.factorizaciones[clave] = Q[:, :int((diag > tol).sum())]
+            self.modificado = True
+            while len(self.factorizaciones) > self.max_factorizaciones:
+                self.factorizaciones.popitem(last=False)
+        return self.factorizaciones[clave]
+
+
+def nombre_termino(termino):
+    """Etiqueta de un término al estilo patsy: ('A', 'B') -> 'C(A):C(B)'"""
+    return ':'.join(f'C({f})' for f in termino)
+
+
+def terminos_factoriales(factores, interacciones=True):
+    """Lista jerárquica de términos: efectos principales y (opcional) todas las interacciones"""
+    if not interacciones:
+        return [(f,) for f in factores]
+    return [t for k in range(1, len(factores) + 1) for t in combinations(factores, k)]
+
+
+def formula_dbca(factores, bloque='Bloque', interacciones=True):
+    """Lado derecho de la fórmula del modelo, p. ej. 'C(Bloque) + C(Variedad)*C(Riego)'"""
+    union = '*' if interacciones else ' + '
+    partes = ([f'C({bloque})'] if bloque is not None else []) + [union.join(f'C({f})' for f in factores)]
+    return ' + '.join(partes)
+
+
+def _matriz_termino(codigos, niveles, termino):
+    """Columnas de contraste tratamiento (primer nivel como referencia) para un término"""
+    n_celdas = len(next(iter(codigos.values())))
+    X = np.ones((n_celdas, 1))
+    for f in termino:
+        D = (codigos[f][:, None] == np.arange(1, niveles[f])).astype(float)
+        X = (X[:, :, None] * D[:, None, :]).reshape(n_celdas, -1)
+    return X
+
+
+def construir_diseno(df, factores, bloque='Bloque', interacciones=True):
+    """Agrupa las filas en celdas (bloque × factores) y arma la matriz de diseño por celda"""
+    factores = list(factores)
+    columnas = ([bloque] if bloque is not None else []) + factores
+    grupos = df.groupby(columnas, observed=True, sort=True)
+    # ngroup deja NaN en las filas con algún factor faltante: código -1 (no entran en ninguna celda)
+    codigos = grupos.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    indice = grupos.size().index
+    if not isinstance(indice, pd.MultiIndex):
+        indice = pd.MultiIndex.from_arrays([indice])
+    # Con factores categóricos los niveles incluyen los no observados: no son columnas del diseño
+    indice = indice.remove_unused_levels()
+
+    codigos_nivel = {f: indice.codes[i] for i, f in enumerate(indice.names)}
+    niveles = {f: len(indice.levels[i]) for i, f in enumerate(indice.names)}
+    terminos = terminos_factoriales(factores, interacciones)
+    bloques_X, columnas_termino, inicio = [np.ones((len(indice), 1))], {}, 1
+    for termino in ([(bloque,)] if bloque is not None else []) + terminos:
+        Xt = _matriz_termino(codigos_nivel, niveles, termino)
+        bloques_X.append(Xt)
+        columnas_termino[termino] = (inicio, inicio + Xt.shape[1])
+        inicio += Xt.shape[1]
+    return DisenoDBCA(bloque=bloque, factores=factores, terminos=terminos, indice=indice,
+                      codigos=codigos, X=np.hstack(bloques_X), columnas_termino=columnas_termino)
+
+
+def estadisticos_celda(diseno, df, respuestas):
+    """
+    Estadísticos suficientes por celda para cada respuesta (matrices celdas × respuestas):
+    n, media y sc (suma de cuadrados intra-celda). Las filas con respuesta
+    faltante no cuentan; las celdas vacías tienen n = 0 y media 0.
+    """
+    c, k = len(diseno.indice), len(respuestas)
+    n, medias, sc = np.zeros((c, k)), np.zeros((c, k)), np.zeros((c, k))
+    for j, respuesta in enumerate(respuestas):
+        y = df[respuesta].to_numpy(dtype=float)
+        validas = (diseno.codigos >= 0) & ~np.isnan(y)
+        cod, yv = diseno.codigos[validas], y[validas]
+        n[:, j] = np.bincount(cod, minlength=c)
+        np.divide(np.bincount(cod, weights=yv, minlength=c), n[:, j], out=medias[:, j], where=n[:, j] > 0)
+        sc[:, j] = np.bincount(cod, weights=(yv - medias[cod, j]) ** 2, minlength=c)
+    return n, medias, sc
+
+
+def _es_ortogonal(n, bloque, factores):
+    """Tratamientos completos y balanceados con frecuencias bloque × tratamiento proporcionales"""
+    n_trat = n.groupby(level=list(factores)).sum()
+    # Falta una combinación entera de niveles (p. ej. ninguna parcela A_Alto_Alto): no es un factorial completo
+    combinaciones = np.prod([len(n.index.levels[n.index.names.index(f)]) for f in factores])
+    if len(n_trat) < combinaciones:
+        return False
+    if (n_trat <= 0).any() or not np.allclose(n_trat, n_trat.iloc[0]):
+        return False
+    if bloque is None:
+        return True
+    tabla_n = n.unstack(list(factores), fill_value=0.0)
+    esperado = np.outer(tabla_n.sum(axis=1), tabla_n.sum(axis=0)) / n.sum()
+    return np.allclose(tabla_n.to_numpy(), esperado)
+
+
+def _anova_cerrada(diseno, n, medias):
+    """Efectos por celda (inclusión-exclusión de medias marginales) y sus sumas de cuadrados"""
+    n = pd.Series(n, index=diseno.indice)
+    sumas = pd.DataFrame(medias * n.to_numpy()[:, None], index=diseno.indice)
+    media_global = sumas.sum().to_numpy() / n.sum()
+    cache = {(): pd.DataFrame(np.broadcast_to(media_global, medias.shape), index=diseno.indice)}
+
+    def media_marginal(grupo):
+        if grupo not in cache:
+            n_grupo = n.groupby(level=list(grupo)).transform('sum')
+            cache[grupo] = sumas.groupby(level=list(grupo)).transform('sum').div(n_grupo, axis=0)
+        return cache[grupo]
+
+    niveles = dict(zip(diseno.indice.names, (len(lv) for lv in diseno.indice.levels)))
+    filas, gl = {}, {}
+    ajuste_celda = cache[()].copy()
+    for termino in diseno.todos_terminos:
+        efecto = sum(
+            (-1) ** (len(termino) - k) * media_marginal(sub)
+            for k in range(len(termino) + 1)
+            for sub in combinations(termino, k)
+        )
+        filas[termino] = (efecto ** 2).mul(n, axis=0).sum().to_numpy()
+        gl[termino] = int(np.prod([niveles[f] - 1 for f in termino]))
+        ajuste_celda += efecto
+    return filas, gl, ajuste_celda.to_numpy()
+
+
+def anova_qr(diseno, n, medias):
+    """
+    Sumas de cuadrados Tipo II comparando submodelos sobre las celdas de
+    `diseno` (`n` parcelas y `medias` por celda, una columna por respuesta;
+    todas comparten cada QR). Devuelve ({término: SC}, {término: gl}, medias
+    ajustadas por celda).
+    """
+    w = np.sqrt(n)
+    Yw = w[:, None] * medias
+    yy = (Yw * Yw).sum(axis=0)
+
+    def ajustar(incluidos):
+        Q = diseno.factorizar(n, incluidos)
+        proy = Q.T @ Yw
+        return Q.shape[1], yy - (proy * proy).sum(axis=0), Q @ proy
+
+    todos = diseno.todos_terminos
+    _, _, ajustados_w = ajustar(todos)
+    filas, gl = {}, {}
+    for termino in todos:
+        base = [t for t in todos if not set(termino).issubset(t)]
+        rango_base, sc_base, _ = ajustar(base)
+        rango_con, sc_con, _ = ajustar(base + [termino])
+        filas[termino] = sc_base - sc_con
+        gl[termino] = rango_con - rango_base
+    ajuste_celda = np.divide(ajustados_w, w[:, None], out=np.zeros_like(ajustados_w), where=w[:, None] > 0)
+    return filas, gl, ajuste_celda
+
+
+def _resultados(df, diseno, respuestas, n, medias, sc, filas, gl, ajuste_celda, metodo):
+    """Arma un ResultadoDBCA por respuesta a partir de las sumas de cuadrados de los términos"""
+    n_total = n.sum()
+    gl_residual = int(n_total - 1 - sum(gl.values()))
+    resultados = {}
+    for j, respuesta in enumerate(respuestas):
+        mj, aj = medias[:, j], ajuste_celda[:, j]
+        media_global = (n * mj).sum() / n_total
+        sc_total = float(sc[:, j].sum() + (n * (mj - media_global) ** 2).sum())
+        sc_residual = float(sc[:, j].sum() + (n * (mj - aj) ** 2).sum())
+        cme = sc_residual / gl_residual if gl_residual > 0 else np.nan
+
+        tabla = pd.DataFrame(
+            [[float(filas[t][j]), float(gl[t])] for t in filas] + [[sc_residual, float(gl_residual)]],
+            index=[nombre_termino(t) for t in filas] + ['Residual'],
+            columns=COLUMNAS_ANOVA[:2],
+        )
+        efectos = tabla.index != 'Residual'
+        tabla['F'] = np.nan
+        tabla.loc[efectos, 'F'] = (tabla.loc[efectos, 'sum_sq'] / tabla.loc[efectos, 'df']) / cme
+        tabla['PR(>F)'] = np.nan
+        # fdtrc es stats.f.sf sin el costo de importar scipy.stats
+        tabla.loc[efectos, 'PR(>F)'] = fdtrc(tabla.loc[efectos, 'df'], gl_residual, tabla.loc[efectos, 'F'])
+
+        validas = (diseno.codigos >= 0) & df[respuesta].notna().to_numpy()
+        ajustados = pd.Series(np.nan, index=df.index)
+        ajustados[validas] = aj[diseno.codigos[validas]]
+        rsquared = 1 - sc_residual / sc_total
+        rsquared_adj = 1 - (1 - rsquared) * (n_total - 1) / gl_residual if gl_residual > 0 else np.nan
+        resultados[respuesta] = ResultadoDBCA(
+            tabla=tabla, ajustados=ajustados, residuos=df[respuesta] - ajustados, cme=cme,
+            gl_residual=gl_residual, rsquared=rsquared, rsquared_adj=rsquared_adj, metodo=metodo)
+    return resultados
+
+
+def anova_dbca_multiple(df, respuestas, factores, bloque='Bloque', interacciones=True, cache=None):
+    """
+    ANOVA Tipo II del mismo modelo DBCA para varias variables respuesta.
+
+    Las respuestas con el mismo patrón de datos faltantes comparten la
+    estructura de celdas: el diseño se factoriza una sola vez y cada
+    respuesta es un lado derecho adicional de la misma solución.
+    Con `cache` (CacheDisenos) la disposición de campo y sus factorizaciones
+    se reutilizan entre llamadas. Devuelve un diccionario {respuesta: ResultadoDBCA}.
+    """
+    respuestas = list(respuestas)
+    if cache is None:
+        clave, diseno = None, construir_diseno(df, factores, bloque, interacciones)
+    else:
+        clave, diseno = cache.obtener_diseno(df, factores, bloque, interacciones)
+    n, medias, sc = estadisticos_celda(diseno, df, respuestas)
+
+    # Agrupar respuestas con idéntico conteo por celda (mismo patrón de faltantes)
+    lotes = {}
+    for j in range(len(respuestas)):
+        lotes.setdefault(n[:, j].tobytes(), []).append(j)
+
+    resultados = {}
+    for columnas in lotes.values():
+        n_lote = n[:, columnas[0]]
+        if _es_ortogonal(pd.Series(n_lote, index=diseno.indice), bloque, diseno.factores):
+            metodo = 'cerrado'
+            filas, gl, ajuste_celda = _anova_cerrada(diseno, n_lote, medias[:, columnas])
+        else:
+            metodo = 'qr'
+            filas, gl, ajuste_celda = anova_qr(diseno, n_lote, medias[:, columnas])
+        resultados.update(_resultados(df, diseno, [respuestas[j] for j in columnas], n_lote,
+                                      medias[:, columnas], sc[:, columnas], filas, gl,
+                                      ajuste_celda, metodo))
+    if cache is not None:
+        cache.guardar(clave, diseno)
+    return {r: resultados[r] for r in respuestas}
+
+
+def anova_dbca(df, respuesta, factores, bloque='Bloque', interacciones=True, cache=None):
+    """
+    ANOVA Tipo II para el modelo `respuesta ~ C(bloque) + C(f1) * C(f2) * ...`.
+
+    Con interacciones=False ajusta sólo efectos principales. Con bloque=None
+    el modelo no incluye término de bloque. Devuelve un ResultadoDBCA.
+    """
+    return anova_dbca_multiple(df, [respuesta], factores, bloque, interacciones, cache)[respuesta]
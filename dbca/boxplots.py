@@ -0,0 +1,267 @@
+"""
+Boxplots detallados del análisis DBCA
+Incluye visualizaciones por factor, bloque e interacciones y estadísticas
+descriptivas por grupo. matplotlib y seaborn se importan sólo al dibujar, y
+la figura se renderiza sin pantalla con dbca.figuras. Las medias y las tablas
+describe() salen del IndiceGrupos del dataset (dbca.grupos). En modo resumen
+las cajas se dibujan con bxp desde cuartiles, bigotes y una muestra acotada
+de atípicos por grupo (dbca.cajas) y los violines con una KDE binned por FFT
+(dbca.violines), sin pasar los datos crudos a seaborn.
+
+Los doce paneles se describen en el registro PANELES (factor, hue, orden,
+paleta y tipo de gráfico); la hoja completa los dibuja todos y
+figura_panel dibuja uno solo (lo usa el servicio dbca.servicio).
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .cajas import MAX_ATIPICOS, dibujar_cajas, resumen_caja
+from .datos import leer_datos
+from .figuras import CacheFiguras, Figura, imprimir_tiempos, renderizar_figuras
+from .grupos import COLUMNAS_DESCRIBE, IndiceGrupos
+from .violines import dibujar_violines_seaborn, estadisticas_violin
+
+DATOS = ('quinua_simulada_es.csv', 'quinua_simulada.csv')
+
+
+def cargar_datos(rutas=DATOS):
+    """Dataset traducido o el original (mismos nombres y niveles) con factores ordenados y Tratamiento"""
+    df, _ = leer_datos(*rutas, columnas=['Rendimiento_kg'])
+    return df
+
+
+def _estilo(ax, titulo, xlabel, leyenda=None):
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.set_xlabel(xlabel, fontsize=10)
+    ax.set_ylabel('Rendimiento (kg)', fontsize=10)
+    if leyenda is not None:
+        ax.legend(title=leyenda, loc='upper right')
+    ax.grid(True, alpha=0.3)
+
+
+# Líneas de las cajas en modo resumen (gris oscuro, como seaborn)
+_LINEAS = {'color': '0.26', 'linewidth': 1.25}
+
+
+def _cajas_resumen(ax, indice, x, paleta, orden=None, hue=None, hue_orden=None,
+                   max_atipicos=MAX_ATIPICOS):
+    """Boxplot con la disposición de sns.boxplot (x, hue) dibujado con bxp desde resúmenes"""
+    import seaborn as sns
+
+    def colores(n):
+        # seaborn rellena las cajas con la paleta desaturada al 75 %
+        return [sns.desaturate(color, 0.75) for color in sns.color_palette(paleta, n)]
+
+    def dibujar(resumenes, color, posiciones, ancho):
+        return dibujar_cajas(ax, resumenes, colores=color, posiciones=posiciones, anchos=ancho,
+                             etiquetas=False, boxprops={'edgecolor': _LINEAS['color'],
+                                                        'linewidth': _LINEAS['linewidth']},
+                             whiskerprops=_LINEAS, capprops=_LINEAS, medianprops=_LINEAS,
+                             flierprops={'markeredgecolor': _LINEAS['color']})
+
+    orden = orden or indice.niveles(x)
+    if hue is None:
+        datos = dict(zip(*indice.valores('Rendimiento_kg', x)))
+        presentes = [(i, nivel, color) for i, (nivel, color) in enumerate(zip(orden, colores(len(orden))))
+                     if nivel in datos]
+        dibujar([resumen_caja(datos[nivel], nivel, max_atipicos=max_atipicos) for _, nivel, _ in presentes],
+                [color for _, _, color in presentes], [i for i, _, _ in presentes], 0.8 * 0.8)
+    else:
+        # Cajas de cada nivel de `hue` desplazadas dentro del ancho 0.8 de cada nivel de `x`
+        hue_orden = hue_orden or indice.niveles(hue)
+        datos = dict(zip(*indice.valores('Rendimiento_kg', [x, hue])))
+        ancho = 0.8 / len(hue_orden)
+        for j, (nivel_hue, color) in enumerate(zip(hue_orden, colores(len(hue_orden)))):
+            presentes = [(i, datos[(nivel, nivel_hue)]) for i, nivel in enumerate(orden)
+                         if (nivel, nivel_hue) in datos]
+            if presentes:
+                bp = dibujar([resumen_caja(d, max_atipicos=max_atipicos) for _, d in presentes],
+                             [color], [i - 0.4 + (j + 0.5) * ancho for i, _ in presentes], ancho * 0.8)
+                # Una entrada de leyenda por nivel de `hue`
+                bp['boxes'][0].set_label(nivel_hue or ' ')
+    ax.set_xticks(range(len(orden)), orden)
+    ax.set_xlim(-0.5, len(orden) - 0.5)
+
+
+def _violines_resumen(ax, indice, x, paleta, orden=None):
+    """Violines con el aspecto de sns.violinplot y densidad KDE binned por FFT"""
+    import seaborn as sns
+
+    orden = orden or indice.niveles(x)
+    datos = dict(zip(*indice.valores('Rendimiento_kg', x)))
+    grupos = [datos.get(nivel, np.zeros(0)) for nivel in orden]
+    colores = [sns.desaturate(color, 0.75) for color in sns.color_palette(paleta, len(orden))]
+    # Se omiten los niveles sin datos, conservando su posición
+    presentes = [i for i, g in enumerate(grupos) if len(g)]
+    estadisticas = {i: estadisticas_violin(grupos[i], corte=2) for i in presentes}
+    dibujar_violines_seaborn(ax, [estadisticas[i] for i in presentes], [grupos[i] for i in presentes],
+                             [colores[i] for i in presentes], posiciones=presentes)
+    ax.set_xticks(range(len(orden)), orden)
+    ax.set_xlim(-0.5, len(orden) - 0.5)
+
+
+@dataclass(frozen=True)
+class Panel:
+    """
+    Especificación declarativa de un panel: tipo ('caja' o 'violin'), factor
+    del eje x, factor de color (`hue`), paleta y, si difiere del orden de
+    los niveles del factor, el orden de los niveles. En los paneles con
+    `color_media` se marca la media de cada nivel.
+    """
+    nombre: str
+    titulo: str
+    x: str
+    paleta: str
+    tipo: str = 'caja'
+    hue: str = None
+    orden: tuple = None
+    hue_orden: tuple = None
+    color_media: str = None
+    leyenda_media: bool = False
+    rotacion: int = None
+
+
+# Registro de paneles, en el orden de la figura 3 × 4
+PANELES = {panel.nombre: panel for panel in [
+    Panel('bloque', 'Rendimiento por Bloque', 'Bloque', 'Set2', color_media='red', leyenda_media=True),
+    Panel('variedad', 'Rendimiento por Variedad', 'Variedad', 'Set1', color_media='red'),
+    Panel('fertilizante', 'Rendimiento por Nivel de Fertilizante', 'Fertilizante', 'YlOrRd',
+          color_media='darkred'),
+    Panel('riego', 'Rendimiento por Nivel de Riego', 'Riego', 'Blues', color_media='darkblue'),
+    Panel('variedad_bloque', 'Rendimiento: Variedad × Bloque', 'Bloque', 'Set1', hue='Variedad'),
+    Panel('fertilizante_bloque', 'Rendimiento: Fertilizante × Bloque', 'Bloque', 'YlOrRd',
+          hue='Fertilizante'),
+    Panel('riego_bloque', 'Rendimiento: Riego × Bloque', 'Bloque', 'Blues', hue='Riego'),
+    Panel('variedad_fertilizante', 'Rendimiento: Variedad × Fertilizante', 'Fertilizante', 'Set1',
+          hue='Variedad'),
+    Panel('variedad_riego', 'Rendimiento: Variedad × Riego', 'Riego', 'Set1', hue='Variedad'),
+    Panel('fertilizante_riego', 'Rendimiento: Fertilizante × Riego', 'Fertilizante', 'Blues',
+          hue='Riego'),
+    Panel('tratamiento', 'Rendimiento por Tratamiento Completo', 'Tratamiento', 'tab20', rotacion=90),
+    Panel('violin_bloque', 'Distribución de Rendimiento por Bloque\n(Violin Plot)', 'Bloque', 'Set2',
+          tipo='violin'),
+]}
+
+
+def dibujar_panel(ax, indice, panel, resumen=False, max_atipicos=MAX_ATIPICOS):
+    """Dibuja `panel` (un Panel del registro) en `ax`"""
+    import seaborn as sns
+
+    df = indice.df
+    # Niveles observados en el orden del factor (seaborn mostraría también los no observados)
+    orden = list(panel.orden) if panel.orden else indice.niveles(panel.x)
+    hue_orden = list(panel.hue_orden or indice.niveles(panel.hue)) if panel.hue else None
+    if panel.tipo == 'violin' and resumen:
+        _violines_resumen(ax, indice, panel.x, panel.paleta, orden)
+    elif panel.tipo == 'violin':
+        sns.violinplot(data=df, x=panel.x, y='Rendimiento_kg', order=orden, palette=panel.paleta, ax=ax)
+    elif resumen:
+        _cajas_resumen(ax, indice, panel.x, panel.paleta, orden, panel.hue, hue_orden, max_atipicos)
+    elif panel.hue is None:
+        sns.boxplot(data=df, x=panel.x, y='Rendimiento_kg', order=orden, palette=panel.paleta, ax=ax)
+    else:
+        sns.boxplot(data=df, x=panel.x, y='Rendimiento_kg', hue=panel.hue, palette=panel.paleta, ax=ax,
+                    order=orden, hue_order=hue_orden)
+    _estilo(ax, panel.titulo, panel.x, leyenda=panel.hue)
+    if panel.rotacion is not None:
+        ax.set_xlabel(panel.x, fontsize=8)
+        ax.tick_params(axis='x', rotation=panel.rotacion, labelsize=7)
+
+    if panel.color_media is not None:
+        means = indice.medias('Rendimiento_kg', panel.x).reindex(orden)
+        for j, mean in enumerate(means):
+            ax.plot(j, mean, marker='D', color=panel.color_media, markersize=8,
+                    label='Media' if panel.leyenda_media and j == 0 else '')
+        if panel.leyenda_media:
+            ax.legend()
+
+
+def _configurar_estilo():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.style.use('seaborn-v0_8-darkgrid')
+    sns.set_palette("Set2")
+
+
+def figura_boxplots(indice, resumen=False, max_atipicos=MAX_ATIPICOS):
+    """
+    Figura 3 × 4 con todos los paneles del registro: boxplots por factor,
+    interacciones, tratamientos y violin por bloque. Con `resumen`, las cajas
+    se dibujan con bxp desde resúmenes por grupo (a lo sumo `max_atipicos`
+    atípicos por caja) en lugar de seaborn.
+    """
+    import matplotlib.pyplot as plt
+
+    _configurar_estilo()
+    fig = plt.figure(figsize=(20, 16))
+    for i, panel in enumerate(PANELES.values()):
+        dibujar_panel(plt.subplot(3, 4, i + 1), indice, panel, resumen, max_atipicos)
+    plt.tight_layout()
+    return fig
+
+
+def figura_panel(indice, nombre, resumen=False, max_atipicos=MAX_ATIPICOS, tamano=(5, 4)):
+    """Figura con un solo panel del registro (KeyError si `nombre` no existe)"""
+    import matplotlib.pyplot as plt
+
+    panel = PANELES[nombre]
+    _configurar_estilo()
+    fig, ax = plt.subplots(figsize=tamano)
+    dibujar_panel(ax, indice, panel, resumen, max_atipicos)
+    fig.tight_layout()
+    return fig
+
+
+def estadisticas_descriptivas(indice):
+    """describe() del rendimiento por Bloque, cada factor y Tratamiento"""
+    print("\n" + "="*80)
+    print("ESTADÍSTICAS DESCRIPTIVAS")
+    print("="*80)
+
+    columnas = ['Bloque', 'Variedad', 'Fertilizante', 'Riego', 'Tratamiento']
+    etiquetas = ['Bloque', 'Variedad', 'Fertilizante', 'Riego', 'Tratamiento Completo']
+    tabla = indice.describir_conjuntos('Rendimiento_kg', columnas)
+    for i, (col, etiqueta) in enumerate(zip(columnas, etiquetas), start=1):
+        print(f"\n{i}. Por {etiqueta}:")
+        print(tabla.loc[tabla['conjunto'] == col, [col] + COLUMNAS_DESCRIBE].set_index(col))
+
+
+def ejecutar_boxplots(rutas=DATOS, graficos=True, mostrar=False, resumen=False,
+                      max_atipicos=MAX_ATIPICOS, directorio_cache=None):
+    """
+    Figura de boxplots detallados (sin pantalla, salvo con `mostrar`; con
+    `resumen`, dibujada desde resúmenes por grupo) y estadísticas
+    descriptivas. Con `directorio_cache`, la figura se copia de su
+    subdirectorio 'figuras' si los datos no cambiaron.
+    """
+    df = cargar_datos(rutas)
+    indice = IndiceGrupos(df)
+    print("="*80)
+    print("GENERACIÓN DE BOXPLOTS DETALLADOS - ANÁLISIS DBCA")
+    print("="*80)
+
+    if graficos:
+        inicio = time.perf_counter()
+        figura = Figura('boxplots', figura_boxplots, (indice, resumen, max_atipicos),
+                        'DBCA_boxplots_detallados.png',
+                        insumos=(df[['Bloque', 'Variedad', 'Fertilizante', 'Riego', 'Tratamiento',
+                                     'Rendimiento_kg']],))
+        cache = CacheFiguras(os.path.join(directorio_cache, 'figuras')) if directorio_cache else None
+        tiempos = renderizar_figuras([figura], mostrar=mostrar, cache=cache)
+        print(f"\n✓ Boxplots guardados en: {figura.salida}")
+        imprimir_tiempos(tiempos, time.perf_counter() - inicio)
+    estadisticas_descriptivas(indice)
+
+    print("\n" + "="*80)
+    print("ANÁLISIS DE BOXPLOTS COMPLETADO")
+    print("="*80)
+
+    if graficos and mostrar:
+        import matplotlib.pyplot as plt
+        plt.show()
+    return df
@@ -0,0 +1,94 @@
+"""
+Cache de disposiciones de campo (DisenoDBCA) para el motor anova_dbca
+Guarda la matriz de diseño por celda, el mapa término → columnas, la
+asignación fila → celda y las factorizaciones QR ya calculadas.
+
+Clave: fórmula del modelo + hash de las columnas de factores. Nuevas
+mediciones sobre las mismas parcelas (sólo cambian las respuestas) reutilizan
+el diseño sin reconstruirlo. Se mantiene en memoria con desalojo LRU y,
+opcionalmente, en disco (un archivo .pkl por disposición).
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+import pandas as pd
+
+from .anova import construir_diseno, formula_dbca
+
+
+def clave_diseno(df, factores, bloque='Bloque', interacciones=True):
+    """Huella de la fórmula del modelo y del contenido de las columnas de factores"""
+    columnas = ([bloque] if bloque is not None else []) + list(factores)
+    huella = hashlib.sha1(formula_dbca(factores, bloque, interacciones).encode('utf-8'))
+    # El orden de los niveles (tipo categórico) define las celdas y los contrastes
+    huella.update(repr([df[col].dtype for col in columnas]).encode('utf-8'))
+    huella.update(pd.util.hash_pandas_object(df[columnas], index=False).to_numpy().tobytes())
+    return huella.hexdigest()
+
+
+class CacheDisenos:
+    """Cache LRU de DisenoDBCA con persistencia opcional en `directorio`"""
+
+    def __init__(self, max_entradas=32, directorio=None):
+        self.max_entradas = max_entradas
+        self.directorio = directorio
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f'{clave}.pkl')
+
+    def _leer_disco(self, clave):
+        if self.directorio is None or not os.path.exists(self._ruta(clave)):
+            return None
+        try:
+            with open(self._ruta(clave), 'rb') as f:
+                diseno = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Archivo dañado o escrito por otra versión del paquete: se reconstruye
+            return None
+        # Archivos anteriores guardan las factorizaciones en un dict sin orden de uso
+        diseno.factorizaciones = OrderedDict(diseno.factorizaciones)
+        diseno.modificado = False
+        return diseno
+
+    def obtener_diseno(self, df, factores, bloque='Bloque', interacciones=True):
+        """Devuelve (clave, diseno): desde memoria, desde disco o construido de nuevo"""
+        clave = clave_diseno(df, factores, bloque, interacciones)
+        diseno = self._entradas.get(clave)
+        if diseno is not None:
+            self._entradas.move_to_end(clave)
+        else:
+            diseno = self._leer_disco(clave)
+        if diseno is None:
+            self.fallos += 1
+            diseno = construir_diseno(df, factores, bloque, interacciones)
+        else:
+            self.aciertos += 1
+        self.guardar(clave, diseno)
+        return clave, diseno
+
+    def guardar(self, clave, diseno):
+        """Registra el diseño (más reciente en el LRU) y lo persiste si cambió"""
+        self._entradas[clave] = diseno
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+        if self.directorio is not None and diseno.modificado:
+            # Escritura atómica: otro proceso nunca lee un archivo a medio escribir
+            fd, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(diseno, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, self._ruta(clave))
+            diseno.modificado = False
+
+    def limpiar(self):
+        """Vacía la memoria (los archivos en disco se conservan)"""
+        self._entradas.clear()
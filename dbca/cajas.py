@@ -0,0 +1,328 @@
+"""
+Boxplots a partir de estadísticos resumidos
+Cada caja se describe con sus cuartiles, bigotes (1.5 × IQR), media y una
+muestra acotada de atípicos, y se dibuja con Axes.bxp: matplotlib no recibe
+los datos crudos, no los reordena y dibuja a lo sumo `max_atipicos` puntos
+por caja.
+
+Los resúmenes se obtienen de dos formas:
+  - exactos, de los valores ya ordenados de cada grupo (IndiceGrupos.valores):
+    los cuantiles salen por posición, igual que cbook.boxplot_stats;
+  - aproximados, con BocetoCajas, que recorre los datos por bloques con
+    memoria constante por grupo: una muestra uniforme de tamaño fijo para los
+    cuartiles y los `extremos` valores más bajos y más altos (exactos) para
+    bigotes y atípicos. Conteo, suma, mínimo y máximo son exactos.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .datos import (NIVEL_FALTANTE, VALORES_FALTANTES, niveles_esquema, niveles_factor, renombres_esquema,
+                    separador_csv)
+
+MAX_ATIPICOS = 100
+
+
+def _cuantil(x, q):
+    """Cuantil q de `x` ordenado, con la interpolación lineal de np.percentile"""
+    posicion = (len(x) - 1) * q
+    bajo = int(np.floor(posicion))
+    alto = min(bajo + 1, len(x) - 1)
+    t = posicion - bajo
+    diferencia = x[alto] - x[bajo]
+    return x[alto] - diferencia * (1 - t) if t >= 0.5 else x[bajo] + diferencia * t
+
+
+def _limitar(atipicos, maximo):
+    """Submuestra determinista (equiespaciada, conserva los extremos) de a lo sumo `maximo` atípicos"""
+    if maximo is None or len(atipicos) <= maximo:
+        return atipicos
+    if maximo <= 0:
+        return atipicos[:0]
+    return atipicos[np.unique(np.linspace(0, len(atipicos) - 1, maximo).round().astype(np.int64))]
+
+
+def _resumen(etiqueta, n, media, q1, mediana, q3, whislo, whishi, atipicos, max_atipicos):
+    iqr = q3 - q1
+    return {
+        'label': etiqueta, 'n': n, 'mean': media, 'iqr': iqr,
+        'q1': q1, 'med': mediana, 'q3': q3, 'whislo': whislo, 'whishi': whishi,
+        'cilo': mediana - 1.57 * iqr / np.sqrt(n), 'cihi': mediana + 1.57 * iqr / np.sqrt(n),
+        'fliers': _limitar(atipicos, max_atipicos), 'n_atipicos': len(atipicos),
+    }
+
+
+def resumen_caja(ordenados, etiqueta=None, whis=1.5, max_atipicos=MAX_ATIPICOS):
+    """Estadísticos de una caja (formato de Axes.bxp) a partir de valores ordenados sin NaN"""
+    x = np.asarray(ordenados, dtype=float)
+    if len(x) == 0:
+        return _resumen(etiqueta, 0, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan,
+                        x, max_atipicos)
+    q1, mediana, q3 = _cuantil(x, 0.25), _cuantil(x, 0.5), _cuantil(x, 0.75)
+    iqr = q3 - q1
+    # Bigotes: dato más extremo dentro de 1.5 × IQR (búsqueda binaria en lugar de máscaras)
+    alto = np.searchsorted(x, q3 + whis * iqr, side='right')
+    whishi = x[alto - 1] if alto > 0 and x[alto - 1] >= q3 else q3
+    bajo = np.searchsorted(x, q1 - whis * iqr, side='left')
+    whislo = x[bajo] if bajo < len(x) and x[bajo] <= q1 else q1
+    atipicos = np.concatenate([x[:np.searchsorted(x, whislo, side='left')],
+                               x[np.searchsorted(x, whishi, side='right'):]])
+    return _resumen(etiqueta, len(x), np.mean(x), q1, mediana, q3, whislo, whishi,
+                    atipicos, max_atipicos)
+
+
+def _etiqueta(clave, separador):
+    return separador.join(map(str, clave)) if isinstance(clave, tuple) else str(clave)
+
+
+def resumenes_grupos(indice, variable, columnas, whis=1.5, max_atipicos=MAX_ATIPICOS,
+                     separador='-'):
+    """Resúmenes exactos de `variable` por grupo de `columnas` a partir de un IndiceGrupos"""
+    claves, grupos = indice.valores(variable, columnas)
+    return [resumen_caja(datos, _etiqueta(clave, separador), whis, max_atipicos)
+            for clave, datos in zip(claves, grupos)]
+
+
+def _fusionar(estado, nuevos, k, n_grupos):
+    """
+    Conserva, por grupo, las `k` filas de menor clave de `estado` + `nuevos`
+    (tuplas (códigos, clave, ...) ordenadas por código y clave). Devuelve el
+    nuevo estado y el umbral de entrada de cada grupo (inf si tiene menos de k).
+    """
+    combinados = [np.concatenate([previo, nuevo]) for previo, nuevo in zip(estado, nuevos)]
+    codigos, clave = combinados[:2]
+    orden = np.lexsort((clave, codigos))
+    ordenados = codigos[orden]
+    rango = np.arange(len(orden)) - np.searchsorted(ordenados, ordenados, side='left')
+    quedan = orden[rango < k]
+    estado = tuple(arreglo[quedan] for arreglo in combinados)
+    conteo = np.bincount(estado[0], minlength=n_grupos)
+    umbral = np.full(n_grupos, np.inf)
+    llenos = conteo >= k
+    umbral[llenos] = estado[1][np.cumsum(conteo)[llenos] - 1]
+    return estado, umbral
+
+
+class BocetoCajas:
+    """
+    Resumen en streaming de una variable por grupo, con memoria constante por
+    grupo: `tamano_muestra` valores (muestra uniforme por claves aleatorias,
+    bottom-k) y los `extremos` valores más bajos y más altos. Se alimenta por
+    bloques con actualizar(codigos, valores); los códigos de grupo son enteros
+    >= 0 (negativos = fila sin grupo) y deben ser consistentes entre bloques.
+    Un grupo con a lo sumo `tamano_muestra` valores se resume de forma exacta;
+    en los demás, 'n_atipicos' cuenta sólo los atípicos entre los extremos
+    conservados (cota inferior).
+    """
+
+    def __init__(self, tamano_muestra=4096, extremos=MAX_ATIPICOS, semilla=0):
+        if tamano_muestra < 2 * extremos:
+            raise ValueError("tamano_muestra debe ser al menos 2 × extremos")
+        self.tamano_muestra = tamano_muestra
+        self.extremos = extremos
+        self._rng = np.random.default_rng(semilla)
+        self.n = np.zeros(0, dtype=np.int64)
+        self.suma = np.zeros(0)
+        vacio = (np.zeros(0, dtype=np.int64), np.zeros(0))
+        # Estados (códigos, clave, valores): muestra por clave aleatoria, bajos por
+        # valor y altos por -valor, con el umbral de entrada de cada grupo
+        self._muestra = vacio + (np.zeros(0),)
+        self._bajos = vacio
+        self._altos = vacio
+        self._umbrales = [np.zeros(0)] * 3
+
+    @property
+    def n_grupos(self):
+        return len(self.n)
+
+    def actualizar(self, codigos, valores):
+        """Incorpora un bloque de filas (código de grupo y valor por fila)"""
+        codigos = np.asarray(codigos, dtype=np.int64)
+        valores = np.asarray(valores, dtype=float)
+        validas = (codigos >= 0) & ~np.isnan(valores)
+        codigos, valores = codigos[validas], valores[validas]
+        if len(codigos) == 0:
+            return self
+        n_grupos = max(self.n_grupos, int(codigos.max()) + 1)
+        self.n = np.pad(self.n, (0, n_grupos - self.n_grupos)) + np.bincount(codigos, minlength=n_grupos)
+        self.suma = np.pad(self.suma, (0, n_grupos - len(self.suma))) + np.bincount(codigos, valores, n_grupos)
+
+        # Sólo se fusionan las filas que superan el umbral de su grupo: tras los
+        # primeros bloques casi ninguna entra y el ordenamiento es pequeño
+        llave = self._rng.random(len(codigos))
+        nuevos = [(codigos, llave, valores), (codigos, valores), (codigos, -valores)]
+        capacidades = [self.tamano_muestra, self.extremos, self.extremos]
+        estados = [self._muestra, self._bajos, self._altos]
+        for i, (estado, nuevo, k) in enumerate(zip(estados, nuevos, capacidades)):
+            umbral = np.pad(self._umbrales[i], (0, n_grupos - len(self._umbrales[i])),
+                            constant_values=np.inf)
+            entran = nuevo[1] < umbral[codigos]
+            estados[i], self._umbrales[i] = _fusionar(estado, [a[entran] for a in nuevo], k, n_grupos)
+        self._muestra, self._bajos, self._altos = estados
+        return self
+
+    def _por_grupo(self, codigos, valores):
+        """Valores ordenados de cada grupo"""
+        orden = np.lexsort((valores, codigos))
+        limites = np.concatenate([[0], np.cumsum(np.bincount(codigos, minlength=self.n_grupos))])
+        ordenados = valores[orden]
+        return [ordenados[a:b] for a, b in zip(limites[:-1], limites[1:])]
+
+    def resumenes(self, etiquetas=None, whis=1.5, max_atipicos=MAX_ATIPICOS):
+        """Resúmenes (formato de Axes.bxp) de cada grupo, en orden de código"""
+        etiquetas = list(range(self.n_grupos)) if etiquetas is None else list(etiquetas)
+        muestras = self._por_grupo(self._muestra[0], self._muestra[2])
+        bajos = self._por_grupo(*self._bajos)
+        altos = self._por_grupo(self._altos[0], -self._altos[1])
+        resultado = []
+        for g, etiqueta in enumerate(etiquetas):
+            n = int(self.n[g]) if g < self.n_grupos else 0
+            if n <= self.tamano_muestra:
+                # La muestra contiene todos los valores del grupo
+                datos = muestras[g] if g < self.n_grupos else np.zeros(0)
+                resultado.append(resumen_caja(datos, etiqueta, whis, max_atipicos))
+                continue
+            s, b, a = muestras[g], bajos[g], altos[g]
+            q1, mediana, q3 = _cuantil(s, 0.25), _cuantil(s, 0.5), _cuantil(s, 0.75)
+            iqr = q3 - q1
+            # Si algún extremo conservado queda dentro del límite, el bigote es exacto;
+            # si no, se estima con la muestra
+            limite = q3 + whis * iqr
+            candidatos = a[a <= limite] if a[0] <= limite else s[s <= limite]
+            whishi = max(candidatos[-1], q3) if len(candidatos) else q3
+            limite = q1 - whis * iqr
+            candidatos = b[b >= limite] if b[-1] >= limite else s[s >= limite]
+            whislo = min(candidatos[0], q1) if len(candidatos) else q1
+            atipicos = np.concatenate([b[b < whislo], a[a > whishi]])
+            resultado.append(_resumen(etiqueta, n, self.suma[g] / n, q1, mediana, q3,
+                                      whislo, whishi, atipicos, max_atipicos))
+        return resultado
+
+
+def cajas_desde_csv(ruta, variable, agrupaciones, tamano_bloque=500_000, tamano_muestra=4096,
+                    extremos=MAX_ATIPICOS, whis=1.5, max_atipicos=MAX_ATIPICOS, semilla=0,
+                    separador='-'):
+    """
+    Resúmenes aproximados de `variable` por grupo de cada agrupación (lista de
+    columnas) leyendo `ruta` una sola vez, por bloques de `tamano_bloque` filas
+    (memoria constante por grupo). Las columnas y los niveles escritos con un
+    alias del esquema (inglés o español) se resuelven como en
+    dbca.datos.leer_datos. Devuelve una lista de resúmenes por agrupación,
+    con los grupos ordenados por sus niveles (orden del esquema de dbca.datos).
+    """
+    agrupaciones = [[columnas] if isinstance(columnas, str) else list(columnas)
+                    for columnas in agrupaciones]
+    usadas = list(dict.fromkeys(col for columnas in agrupaciones for col in columnas))
+    bocetos = [BocetoCajas(tamano_muestra, extremos, semilla) for _ in agrupaciones]
+    codigos_grupo = [{} for _ in agrupaciones]
+    sep = separador_csv(ruta)
+    # Nombre de cada columna pedida en el archivo (puede ser un alias: Fertilizer, Dias_Cosecha, ...)
+    renombres = renombres_esquema(pd.read_csv(ruta, sep=sep, nrows=0).columns, usadas + [variable])
+    origen = {pedida: col for col, pedida in renombres.items()}
+    factores_origen = [origen.get(col, col) for col in usadas]
+    variable_origen = origen.get(variable, variable)
+    # Como en traduccion: en los factores sólo la celda vacía falta ('None' es un nivel)
+    faltantes = {col: [''] for col in factores_origen}
+    faltantes[variable_origen] = VALORES_FALTANTES
+    for bloque in pd.read_csv(ruta, sep=sep, usecols=factores_origen + [variable_origen],
+                              chunksize=tamano_bloque, dtype={col: 'category' for col in factores_origen},
+                              keep_default_na=False, na_values=faltantes):
+        bloque = bloque.rename(columns=renombres)
+        for col in usadas:
+            # Niveles del esquema renombrando categorías: una consulta por nivel, no por fila
+            bloque[col] = niveles_esquema(bloque[col])
+            if col in NIVEL_FALTANTE and bloque[col].hasnans:
+                bloque[col] = bloque[col].cat.add_categories(
+                    [NIVEL_FALTANTE[col]] if NIVEL_FALTANTE[col] not in bloque[col].cat.categories else []
+                ).fillna(NIVEL_FALTANTE[col])
+        y = bloque[variable].to_numpy(dtype=float)
+        factores = {col: pd.factorize(bloque[col]) for col in usadas}
+        for columnas, boceto, vistos in zip(agrupaciones, bocetos, codigos_grupo):
+            # Código combinado (base mixta) de los niveles del bloque; -1 si falta un factor
+            combinado = np.zeros(len(bloque), dtype=np.int64)
+            for col in columnas:
+                codigos, niveles = factores[col]
+                combinado = np.where((combinado < 0) | (codigos < 0), -1,
+                                     combinado * len(niveles) + codigos)
+            presentes = np.flatnonzero(np.bincount(combinado[combinado >= 0]))
+            # Códigos globales: cada clave nueva recibe el siguiente código
+            mapa = np.full(len(presentes) and presentes[-1] + 1, -1, dtype=np.int64)
+            for codigo in presentes:
+                clave, resto = [], codigo
+                for col in reversed(columnas):
+                    niveles = factores[col][1]
+                    clave.append(niveles[resto % len(niveles)])
+                    resto //= len(niveles)
+                mapa[codigo] = vistos.setdefault(tuple(reversed(clave)), len(vistos))
+            boceto.actualizar(np.where(combinado >= 0, mapa[np.maximum(combinado, 0)]
+                                       if len(mapa) else -1, -1), y)
+
+    resultado = []
+    for columnas, boceto, vistos in zip(agrupaciones, bocetos, codigos_grupo):
+        claves = list(vistos)
+        etiquetas = [_etiqueta(clave if len(columnas) > 1 else clave[0], separador) for clave in claves]
+        resumenes = boceto.resumenes(etiquetas, whis, max_atipicos)
+        orden = [{nivel: i for i, nivel in enumerate(niveles_factor(col, {clave[j] for clave in claves}))}
+                 for j, col in enumerate(columnas)]
+        resultado.append([resumenes[g] for g in sorted(
+            range(len(claves)), key=lambda g: [rango[nivel] for rango, nivel in zip(orden, claves[g])])])
+    return resultado
+
+
+def dibujar_cajas(ax, resumenes, colores=None, alpha=None, posiciones=None, anchos=None,
+                  etiquetas=True, **kwargs):
+    """
+    Dibuja `resumenes` con Axes.bxp y rellena las cajas con `colores` (uno por
+    caja, cíclico). Devuelve el diccionario de artistas de bxp.
+    """
+    bp = ax.bxp(resumenes, positions=posiciones, widths=anchos, patch_artist=True,
+                boxprops={'linestyle': 'solid', **kwargs.pop('boxprops', {})},
+                manage_ticks=etiquetas, **kwargs)
+    for i, patch in enumerate(bp['boxes']):
+        if colores is not None:
+            patch.set_facecolor(colores[i % len(colores)])
+        if alpha is not None:
+            patch.set_alpha(alpha)
+    return bp
+
+
+def figura_cajas(paneles, variable):
+    """Una fila de boxplots (uno por agrupación) desde `paneles` = [(columnas, resúmenes)]"""
+    import matplotlib.pyplot as plt
+
+    fig, ejes = plt.subplots(1, len(paneles), figsize=(6 * len(paneles), 5), squeeze=False)
+    for ax, (columnas, resumenes) in zip(ejes[0], paneles):
+        dibujar_cajas(ax, resumenes, colores=['lightblue'], alpha=0.7)
+        ax.set_title(f'{variable} por {" × ".join(columnas)}', fontsize=12, fontweight='bold')
+        ax.set_xlabel(' - '.join(columnas))
+        ax.set_ylabel(variable)
+        if len(resumenes) > 6:
+            ax.tick_params(axis='x', rotation=90, labelsize=7)
+        ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def ejecutar_cajas(ruta, variable, agrupaciones, salida='cajas.png', exacto=False,
+                   tamano_bloque=500_000, tamano_muestra=4096, max_atipicos=MAX_ATIPICOS):
+    """
+    Boxplots de `variable` por cada agrupación (lista de columnas) de un CSV.
+    Por defecto el CSV se lee por bloques y se resume con BocetoCajas (memoria
+    constante por grupo); con `exacto` se carga completo y se usan los
+    cuartiles exactos del IndiceGrupos.
+    """
+    from .figuras import Figura, renderizar_figuras
+
+    if exacto:
+        from .datos import leer_datos
+        from .grupos import IndiceGrupos
+
+        df, _ = leer_datos(ruta, columnas=[variable] + [col for columnas in agrupaciones for col in columnas])
+        indice = IndiceGrupos(df)
+        paneles = [(columnas, resumenes_grupos(indice, variable, columnas, max_atipicos=max_atipicos))
+                   for columnas in agrupaciones]
+    else:
+        resumenes = cajas_desde_csv(ruta, variable, agrupaciones, tamano_bloque, tamano_muestra,
+                                    max(max_atipicos, 1), max_atipicos=max_atipicos)
+        paneles = list(zip(agrupaciones, resumenes))
+    return paneles, renderizar_figuras([Figura('cajas', figura_cajas, (paneles, variable), salida)])
@@ -0,0 +1,293 @@
+"""
+Línea de comandos del paquete dbca
+
+    python -m dbca anova --respuesta Rendimiento_kg Dias_cosecha
+    python -m dbca analisis --sin-graficos
+    python -m dbca boxplots --resumen
+    python -m dbca cajas rendimientos.csv --por Variedad --por Variedad,Riego
+    python -m dbca normativa
+    python -m dbca descriptivas --conjuntos cubo --salida descriptivas.csv
+    python -m dbca servir --directorio ensayos/ --puerto 8050
+    python -m dbca lote ensayos/ --salida resultados.parquet --procesos 8
+    python -m dbca generar --replicas 20000 --salida ensayo_grande.parquet
+    python -m dbca traducir sensores.csv --salida sensores_es.parquet --idioma es
+    python -m dbca potencia --bloques 3 4 5 --replicas 1 2 3 --simulaciones 5000
+    python -m dbca disposicion --tratamientos 200 --tamanos 20 20 20 20 20 20 20 20 20 20
+
+Cada subcomando importa su módulo sólo al ejecutarse: `anova` y `normativa`
+no cargan scipy.stats, matplotlib ni seaborn, y `--sin-graficos` evita
+matplotlib y seaborn en `analisis` y `boxplots`. Las figuras se renderizan
+sin pantalla (backend Agg, sin show()) salvo con `--mostrar`.
+"""
+
+import argparse
+import sys
+import time
+
+
+def _anova(args):
+    from .anova import anova_dbca_multiple
+    from .cache import CacheDisenos
+    from .datos import leer_datos
+
+    df, _ = leer_datos(args.datos)
+    cache = CacheDisenos(directorio=args.cache) if args.cache else None
+    modelos = anova_dbca_multiple(df, args.respuesta, args.factores, args.bloque,
+                                  interacciones=not args.sin_interacciones, cache=cache)
+    for respuesta, modelo in modelos.items():
+        print(f"\nTabla ANOVA - DBCA ({respuesta}):")
+        print(modelo.tabla.to_string())
+        print(f"  R²: {modelo.rsquared:.4f}  |  R² ajustado: {modelo.rsquared_adj:.4f}")
+    return 0
+
+
+def _analisis(args):
+    from .analisis import ejecutar_analisis
+    ejecutar_analisis(args.datos, graficos=not args.sin_graficos, mostrar=args.mostrar,
+                      directorio_cache=args.cache, procesos=args.procesos)
+    return 0
+
+
+def _boxplots(args):
+    from .boxplots import ejecutar_boxplots
+    ejecutar_boxplots(args.datos, graficos=not args.sin_graficos, mostrar=args.mostrar,
+                      resumen=args.resumen, max_atipicos=args.max_atipicos,
+                      directorio_cache=args.cache)
+    return 0
+
+
+def _cajas(args):
+    from .cajas import ejecutar_cajas
+    from .figuras import imprimir_tiempos
+
+    inicio = time.perf_counter()
+    agrupaciones = [por.split(',') for por in args.por]
+    paneles, tiempos = ejecutar_cajas(args.datos, args.variable, agrupaciones, args.salida,
+                                      exacto=args.exacto, tamano_bloque=args.tamano_bloque,
+                                      tamano_muestra=args.tamano_muestra,
+                                      max_atipicos=args.max_atipicos)
+    for columnas, resumenes in paneles:
+        print(f"\n{args.variable} por {' × '.join(columnas)}:")
+        for r in resumenes:
+            print(f"  {r['label']:<30} n={r['n']:<10} Q1={r['q1']:.3f}  Mediana={r['med']:.3f}  "
+                  f"Q3={r['q3']:.3f}  atípicos={r['n_atipicos']}")
+    print(f"\n✓ Boxplots guardados en: {args.salida}")
+    imprimir_tiempos(tiempos, time.perf_counter() - inicio)
+    return 0
+
+
+def _servir(args):
+    from .servicio import servir
+    servir(args.directorio, args.host, args.puerto, args.max_cache_mb * 2 ** 20)
+    return 0
+
+
+def _descriptivas(args):
+    import pandas as pd
+
+    from .datos import COLUMNAS_FACTORES, leer_datos, variables_numericas
+    from .grupos import IndiceGrupos, cubo, rollup
+
+    df, _ = leer_datos(args.datos, faltantes='')
+    factores = args.factores or [col for col in COLUMNAS_FACTORES if col in df]
+    conjuntos = {'cubo': cubo, 'rollup': rollup,
+                 'simple': lambda f: [(col,) for col in f] + [()]}[args.conjuntos](factores)
+    tabla = IndiceGrupos(df).describir_conjuntos(args.variables or variables_numericas(df), conjuntos)
+    if args.salida is None:
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(tabla.to_string(index=False))
+    elif args.salida.endswith('.parquet'):
+        tabla.to_parquet(args.salida, index=False)
+    else:
+        tabla.to_csv(args.salida, index=False)
+    if args.salida is not None:
+        print(f"✓ {len(tabla)} filas ({len(conjuntos)} conjuntos) guardadas en: {args.salida}")
+    return 0
+
+
+def _normativa(args):
+    from .normativa import ejecutar_normativa
+    return ejecutar_normativa(args.datos)
+
+
+def _lote(args):
+    from .lote import ejecutar_lote
+    inicio = time.perf_counter()
+    total = ejecutar_lote(args.entrada, args.salida, args.respuesta, args.procesos)
+    print(f"✓ {total} ensayos analizados en {time.perf_counter() - inicio:.1f} s")
+    print(f"✓ Resultados guardados en: {args.salida}")
+    return 0
+
+
+def _generar(args):
+    from .simulacion import ejecutar_generacion
+    inicio = time.perf_counter()
+    replicas = args.replicas[0] if args.replicas and len(args.replicas) == 1 else args.replicas
+    ejecutar_generacion(args.salida, args.diseno, replicas, args.semilla, args.tamano_bloque,
+                        args.procesos)
+    print(f"\n✓ Ensayo generado en {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+def _traducir(args):
+    from .traduccion import ejecutar_traduccion
+    ejecutar_traduccion(args.entrada, args.salida, args.idioma, args.traduccion, args.tamano_bloque)
+    return 0
+
+
+def _potencia(args):
+    from .potencia import ejecutar_potencia
+    inicio = time.perf_counter()
+    ejecutar_potencia(args.diseno, args.bloques, args.replicas, args.simulaciones, args.alfa,
+                      args.semilla, args.procesos, args.salida)
+    print(f"✓ Potencia calculada en {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+def _disposicion(args):
+    from .disposicion import ejecutar_disposicion
+    inicio = time.perf_counter()
+    ejecutar_disposicion(args.salida, args.diseno, args.tratamientos, args.tamanos, args.criterio,
+                         args.inicios, args.semilla)
+    print(f"✓ Disposición optimizada en {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='dbca', description='Análisis DBCA de ensayos de quinua')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p = sub.add_parser('anova', help='Tablas ANOVA DBCA (sólo texto)')
+    p.add_argument('--datos', default='quinua_5replicas.csv')
+    p.add_argument('--respuesta', nargs='+', default=['Rendimiento_kg'])
+    p.add_argument('--factores', nargs='+', default=['Variedad', 'Fertilizante', 'Riego'])
+    p.add_argument('--bloque', default='Bloque')
+    p.add_argument('--sin-interacciones', action='store_true', help='Sólo efectos principales')
+    p.add_argument('--cache', default=None, help='Directorio del cache de diseños en disco')
+    p.set_defaults(funcion=_anova)
+
+    p = sub.add_parser('analisis', help='Reporte DBCA completo (secciones 1-10)')
+    p.add_argument('--datos', default='quinua_5replicas.csv')
+    p.add_argument('--sin-graficos', action='store_true', help='No generar figuras')
+    p.add_argument('--mostrar', action='store_true',
+                   help='Abrir las figuras en pantalla (por defecto se renderizan sin pantalla)')
+    p.add_argument('--procesos', type=int, default=None,
+                   help='Procesos para renderizar las figuras en paralelo')
+    p.add_argument('--cache', default='cache_dbca',
+                   help="Directorio del cache de diseños y de figuras ('' para desactivarlo)")
+    p.set_defaults(funcion=_analisis)
+
+    p = sub.add_parser('boxplots', help='Boxplots detallados y estadísticas descriptivas')
+    p.add_argument('--datos', nargs='+', default=['quinua_simulada_es.csv', 'quinua_simulada.csv'],
+                   help='Se usa el primer archivo existente')
+    p.add_argument('--sin-graficos', action='store_true', help='Sólo estadísticas descriptivas')
+    p.add_argument('--mostrar', action='store_true',
+                   help='Abrir la figura en pantalla (por defecto se renderiza sin pantalla)')
+    p.add_argument('--resumen', action='store_true',
+                   help='Dibujar las cajas con bxp desde resúmenes por grupo en lugar de seaborn')
+    p.add_argument('--max-atipicos', type=int, default=100, help='Atípicos dibujados por caja')
+    p.add_argument('--cache', default='cache_dbca',
+                   help="Directorio del cache de figuras ('' para desactivarlo)")
+    p.set_defaults(funcion=_boxplots)
+
+    p = sub.add_parser('cajas', help='Boxplots desde resúmenes por grupo de un CSV grande')
+    p.add_argument('datos', help='CSV con la variable y los factores')
+    p.add_argument('--variable', default='Rendimiento_kg')
+    p.add_argument('--por', action='append', required=True,
+                   help='Agrupación (columnas separadas por comas); un panel por cada --por')
+    p.add_argument('--salida', default='DBCA_cajas.png')
+    p.add_argument('--exacto', action='store_true',
+                   help='Cargar el CSV completo y usar cuartiles exactos (por defecto, boceto por bloques)')
+    p.add_argument('--tamano-bloque', type=int, default=500_000, help='Filas por bloque de lectura')
+    p.add_argument('--tamano-muestra', type=int, default=4096, help='Muestra por grupo del boceto')
+    p.add_argument('--max-atipicos', type=int, default=100, help='Atípicos dibujados por caja')
+    p.set_defaults(funcion=_cajas)
+
+    p = sub.add_parser('servir', help='Servicio HTTP local que renderiza paneles de boxplots bajo demanda')
+    p.add_argument('--directorio', default='.', help='Directorio con los CSV de los ensayos')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--puerto', type=int, default=8050)
+    p.add_argument('--max-cache-mb', type=int, default=64, help='Tamaño del cache de PNG en memoria')
+    p.set_defaults(funcion=_servir)
+
+    p = sub.add_parser('descriptivas', help='describe() de todos los rasgos por conjuntos de agrupación')
+    p.add_argument('--datos', default='quinua_5replicas.csv')
+    p.add_argument('--variables', nargs='+', default=None,
+                   help='Rasgos a describir (por defecto, todas las columnas numéricas)')
+    p.add_argument('--factores', nargs='+', default=None)
+    p.add_argument('--conjuntos', choices=['cubo', 'rollup', 'simple'], default='simple',
+                   help='cubo: todas las combinaciones; rollup: prefijos; simple: cada factor y el total')
+    p.add_argument('--salida', default=None, help='Tabla larga (.csv o .parquet); si no, se imprime')
+    p.set_defaults(funcion=_descriptivas)
+
+    p = sub.add_parser('normativa', help='Cumplimiento de rangos agronómicos')
+    p.add_argument('--datos', nargs='+', default=['quinua_simulada_es.csv', 'quinua_simulada.csv'],
+                   help='Se usa el primero que exista (inglés o español)')
+    p.set_defaults(funcion=_normativa)
+
+    p = sub.add_parser('lote', help='Análisis por lotes de ensayos en un pool de procesos')
+    p.add_argument('entrada', help='Directorio (o dataset particionado) con los ensayos')
+    p.add_argument('--salida', default='resultados_ensayos.csv',
+                   help='Tabla de resultados (.csv o .parquet)')
+    p.add_argument('--respuesta', default='Rendimiento_kg')
+    p.add_argument('--procesos', type=int, default=None)
+    p.set_defaults(funcion=_lote)
+
+    p = sub.add_parser('generar', help='Ensayo DBCA simulado desde una especificación de diseño')
+    p.add_argument('--diseno', default=None,
+                   help='Especificación JSON del diseño (por defecto, dbca/disenos/quinua_5replicas.json)')
+    p.add_argument('--salida', default='quinua_5replicas.csv', help='Archivo .csv o .parquet')
+    p.add_argument('--replicas', nargs='+', type=int, default=None,
+                   help='Réplicas de cada tratamiento por bloque (uno por bloque, o uno para todos); '
+                        'por defecto, las del diseño')
+    p.add_argument('--semilla', type=int, default=42)
+    p.add_argument('--tamano-bloque', type=int, default=2 ** 20,
+                   help='Filas por parte (múltiplo de 65536; memoria constante)')
+    p.add_argument('--procesos', type=int, default=None,
+                   help='Procesos que generan las partes (el resultado no depende de este número)')
+    p.set_defaults(funcion=_generar)
+
+    p = sub.add_parser('traducir', help='Traduce columnas y niveles de un CSV por bloques (memoria constante)')
+    p.add_argument('entrada', nargs='?', default='quinua_simulada.csv')
+    p.add_argument('--salida', default='quinua_simulada_es.csv', help='Archivo .csv o .parquet')
+    p.add_argument('--idioma', default='es', help="Idioma del archivo de traducciones (p. ej. 'es', 'pt', 'en')")
+    p.add_argument('--traduccion', default=None,
+                   help='Archivo JSON de traducciones (por defecto, dbca/traducciones/quinua.json)')
+    p.add_argument('--tamano-bloque', type=int, default=500_000, help='Filas por bloque de lectura')
+    p.set_defaults(funcion=_traducir)
+
+    p = sub.add_parser('potencia', help='Potencia Monte Carlo de cada término para diseños candidatos')
+    p.add_argument('--diseno', default=None,
+                   help='Especificación JSON del diseño (por defecto, dbca/disenos/quinua_5replicas.json)')
+    p.add_argument('--bloques', nargs='+', type=int, default=[2, 3, 4, 5, 6])
+    p.add_argument('--replicas', nargs='+', default=['1', '2', '3', '2/2/1'],
+                   help="Réplicas de cada tratamiento por bloque: un número o 'a/b/c' (uno por bloque)")
+    p.add_argument('--simulaciones', type=int, default=2000)
+    p.add_argument('--alfa', type=float, default=0.05)
+    p.add_argument('--semilla', type=int, default=42)
+    p.add_argument('--procesos', type=int, default=None)
+    p.add_argument('--salida', default=None, help='Tabla larga (.csv o .parquet)')
+    p.set_defaults(funcion=_potencia)
+
+    p = sub.add_parser('disposicion', help='Disposición de campo A/D-óptima con orden de parcelas aleatorizado')
+    p.add_argument('--diseno', default=None,
+                   help='Especificación JSON con los tratamientos (por defecto, dbca/disenos/quinua_5replicas.json)')
+    p.add_argument('--tratamientos', type=int, default=None,
+                   help='Número de entradas (T001, T002, ...) en lugar de los tratamientos del diseño')
+    p.add_argument('--tamanos', nargs='+', type=int, default=None,
+                   help='Parcelas de cada bloque (por defecto, tratamientos × réplicas del diseño)')
+    p.add_argument('--criterio', choices=['A', 'D'], default='A')
+    p.add_argument('--inicios', type=int, default=5, help='Asignaciones aleatorias de partida')
+    p.add_argument('--semilla', type=int, default=42)
+    p.add_argument('--salida', default='disposicion_campo.csv')
+    p.set_defaults(funcion=_disposicion)
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    return args.funcion(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
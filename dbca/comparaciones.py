@@ -0,0 +1,149 @@
+"""
+Comparaciones múltiples de medias ajustadas por el modelo DBCA
+Tukey (Tukey-Kramer), LSD de Fisher y Bonferroni usando el cuadrado medio
+del error (CME) y los grados de libertad residuales del modelo con bloques,
+en lugar del CME de un ANOVA de una vía.
+
+Todas las diferencias de medias se calculan a la vez como una matriz k × k;
+el resultado es una tabla de pares y una tabla de grupos con letras de
+agrupamiento (compact letter display: medias que comparten letra no
+difieren significativamente).
+"""
+
+from dataclasses import dataclass
+from string import ascii_lowercase, ascii_uppercase
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.interpolate import CubicSpline
+
+METODOS = ('tukey', 'lsd', 'bonferroni')
+
+# Con más pares que puntos de la grilla, los p-valores de Tukey se interpolan
+PUNTOS_GRILLA_TUKEY = 64
+# La grilla termina donde P(Q > q) baja de este valor; más allá el p-valor se informa como 0
+P_MINIMA_TUKEY = 1e-12
+
+
+@dataclass
+class ResultadoComparaciones:
+    """Tabla de pares (diferencias, IC, p-valores) y tabla de medias con letras"""
+    pares: pd.DataFrame
+    grupos: pd.DataFrame
+    metodo: str
+    alpha: float
+    cme: float
+    gl: int
+
+
+def _sf_rango_studentizado(q, k, gl):
+    """
+    P(Q > q) para el rango studentizado. Cada evaluación exacta es una
+    integral numérica; con muchos pares se interpola log(p) con un spline
+    cúbico sobre una grilla (error absoluto del orden de 1e-6). La grilla
+    llega hasta el q con p = P_MINIMA_TUKEY y no hasta el mayor q, para que
+    un par extremo no la estire; los q más allá reciben p = 0.
+    """
+    if q.size <= PUNTOS_GRILLA_TUKEY:
+        return stats.studentized_range.sf(q, k, gl)
+    tope = min(q.max(), stats.studentized_range.isf(P_MINIMA_TUKEY, k, gl))
+    if tope <= 0:
+        return np.ones_like(q, dtype=float)
+    grilla = np.linspace(0.0, tope, PUNTOS_GRILLA_TUKEY)
+    log_p = np.log(np.clip(stats.studentized_range.sf(grilla, k, gl), 1e-300, 1.0))
+    p = np.exp(np.minimum(CubicSpline(grilla, log_p)(np.minimum(q, tope)), 0.0))
+    return np.where(q > tope, 0.0, p)
+
+
+def letras_agrupamiento(medias, significativas):
+    """
+    Letras de agrupamiento por inserción y absorción (Piepho, 2004).
+    `significativas` es la matriz booleana k × k de pares con diferencia
+    significativa. La media más alta recibe la letra 'a'.
+    """
+    k = len(medias)
+    columnas = np.ones((k, 1), dtype=bool)
+    filas_i, filas_j = np.nonzero(np.triu(significativas, 1))
+    for i, j in zip(filas_i, filas_j):
+        conflicto = columnas[i] & columnas[j]
+        if not conflicto.any():
+            continue
+        viejas = columnas[:, ~conflicto]
+        nuevas = np.hstack([columnas[:, conflicto], columnas[:, conflicto]])
+        r = conflicto.sum()
+        nuevas[i, :r] = False
+        nuevas[j, r:] = False
+        # Absorción: sólo las columnas nuevas pueden quedar contenidas en otra
+        # (una columna vieja contenida en una nueva ya lo estaba en la original)
+        enteras = nuevas.astype(np.int32)
+        en_viejas = (enteras.T @ (1 - viejas.astype(np.int32)) == 0).any(axis=1)
+        contenida = enteras.T @ (1 - enteras) == 0      # [a, b]: a ⊆ b
+        iguales = contenida & contenida.T
+        en_nuevas = (contenida & ~iguales).any(axis=1) | np.tril(iguales, -1).any(axis=1)
+        columnas = np.hstack([viejas, nuevas[:, ~(en_viejas | en_nuevas)]])
+
+    # Ordenar letras según la primera media (de mayor a menor) que las usa
+    orden = np.argsort(-np.asarray(medias), kind='stable')
+    rango = np.empty(k, dtype=int)
+    rango[orden] = np.arange(k)
+    primera = np.where(columnas, rango[:, None], k).min(axis=0)
+    columnas = columnas[:, np.argsort(primera, kind='stable')]
+
+    # Tras 52 letras se agregan sufijos numéricos: a, ..., Z, a1, ..., Z1, a2, ...
+    alfabeto = ascii_lowercase + ascii_uppercase
+    nombres = [alfabeto[c % len(alfabeto)] + (str(c // len(alfabeto)) if c >= len(alfabeto) else '')
+               for c in range(columnas.shape[1])]
+    return [''.join(nombres[c] for c in np.flatnonzero(fila)) for fila in columnas]
+
+
+def comparaciones_multiples(df, respuesta, factor, modelo, metodo='tukey', alpha=0.05):
+    """
+    Comparaciones de todas las parejas de niveles de `factor` con el CME y
+    los GL residuales de `modelo` (ResultadoDBCA del modelo con bloques).
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido: {metodo!r}. Opciones: {', '.join(METODOS)}")
+    resumen = df.groupby(factor, observed=True, sort=True)[respuesta].agg(['mean', 'count'])
+    resumen = resumen[resumen['count'] > 0]
+    niveles = resumen.index.to_numpy()
+    medias = resumen['mean'].to_numpy(dtype=float)
+    n = resumen['count'].to_numpy(dtype=float)
+    k, cme, gl = len(medias), modelo.cme, modelo.gl_residual
+
+    diferencias = medias[None, :] - medias[:, None]
+    error_estandar = np.sqrt(cme * (1 / n[:, None] + 1 / n[None, :]))
+    i, j = np.triu_indices(k, 1)
+    dif, ee = diferencias[i, j], error_estandar[i, j]
+    m = len(dif)
+
+    if metodo == 'tukey':
+        estadistico = np.abs(dif) / (ee / np.sqrt(2))
+        p_valor = _sf_rango_studentizado(estadistico, k, gl)
+        margen = stats.studentized_range.ppf(1 - alpha, k, gl) / np.sqrt(2) * ee
+    else:
+        estadistico = np.abs(dif) / ee
+        p_valor = 2 * stats.t.sf(estadistico, gl)
+        alpha_par = alpha if metodo == 'lsd' else alpha / max(m, 1)
+        if metodo == 'bonferroni':
+            p_valor = np.minimum(p_valor * m, 1.0)
+        margen = stats.t.ppf(1 - alpha_par / 2, gl) * ee
+    p_valor = np.clip(p_valor, 0.0, 1.0)
+    # Decisión con el valor crítico exacto, coherente con los intervalos
+    significativo = np.abs(dif) > margen
+
+    pares = pd.DataFrame({
+        'grupo1': niveles[i], 'grupo2': niveles[j], 'diferencia': dif, 'error_estandar': ee,
+        'estadistico': estadistico, 'p_valor': p_valor,
+        'li': dif - margen, 'ls': dif + margen, 'significativo': significativo,
+    })
+
+    matriz = np.zeros((k, k), dtype=bool)
+    matriz[i, j] = significativo
+    matriz |= matriz.T
+    grupos = pd.DataFrame({'media': medias, 'n': n.astype(int),
+                           'letras': letras_agrupamiento(medias, matriz)},
+                          index=pd.Index(niveles, name=factor))
+    grupos = grupos.sort_values('media', ascending=False)
+    return ResultadoComparaciones(pares=pares, grupos=grupos, metodo=metodo,
+                                  alpha=alpha, cme=cme, gl=gl)
@@ -0,0 +1,371 @@
+"""
+Carga de los datasets de quinua
+Un único cargador para todos los reportes: leer_tabla lee un ensayo (CSV con
+',' o ';', Parquet o Feather) y, para los CSV, escribe junto al archivo
+(en .cache_dbca/) una copia columnar tipada con los factores codificados
+como diccionario; las lecturas siguientes salen de esa copia mientras no
+cambien la fecha de modificación ni el contenido (sha1) del CSV.
+leer_datos toma el primer archivo disponible de una lista de rutas y resuelve
+los alias de columnas y niveles (resolver_esquema) de las variantes en
+inglés y español descritas en dbca/traducciones/quinua.json, así que los
+reportes leen cualquiera de ellas sin una copia traducida.
+
+Esquema de factores: Bloque, Variedad, Fertilizante y Riego se cargan como
+Categorical ordenados con los niveles de NIVELES_FACTORES (Ninguno < Bajo <
+Alto; los niveles fuera del esquema van después, en orden alfabético) y el
+Tratamiento es un código entero derivado de los códigos de los factores
+(base mixta), con las etiquetas 'A_Ninguno_Bajo' sólo como categorías.
+Agrupaciones, matrices de diseño y gráficos trabajan sobre esos códigos.
+
+EscritorTabla escribe tablas por partes (resultados de lotes, ensayos
+simulados) en un único CSV o Parquet.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+FACTORES_TRATAMIENTO = ['Variedad', 'Fertilizante', 'Riego']
+COLUMNAS_FACTORES = ['Bloque'] + FACTORES_TRATAMIENTO
+
+# Orden de los niveles de cada factor (los factores sin entrada se ordenan alfabéticamente)
+NIVELES_FACTORES = {
+    'Fertilizante': ['Ninguno', 'Bajo', 'Alto'],
+    'Riego': ['Bajo', 'Alto'],
+}
+# Nivel de las celdas vacías: el 'None' del dataset original se lee como faltante
+NIVEL_FALTANTE = {'Fertilizante': 'Ninguno'}
+
+# Columnas numéricas que describen el diseño, no rasgos medidos
+COLUMNAS_DISENO = ['Replicacion']
+
+# Valores faltantes de las columnas no factoriales al leer un CSV con keep_default_na=False;
+# en los factores sólo la celda vacía lo es ('None' es un nivel: sin fertilizante)
+VALORES_FALTANTES = ['', 'NA', 'N/A', 'NaN', 'nan', 'NULL', 'null']
+
+# Nombres de columnas y niveles por idioma; de aquí salen también los alias del esquema
+TRADUCCION_QUINUA = os.path.join(os.path.dirname(__file__), 'traducciones', 'quinua.json')
+
+# Copias columnares de los CSV: <directorio del CSV>/.cache_dbca/<archivo>.parquet
+DIRECTORIO_CACHE = '.cache_dbca'
+FORMATOS_CACHE = ('parquet', 'feather')
+# Cambia si cambia la forma de leer o tipar los CSV: invalida las copias anteriores
+VERSION_CACHE = 1
+_CLAVE_ORIGEN = b'dbca_origen'
+
+
+def huella_archivo(ruta):
+    """sha1 del contenido de un archivo (leído por bloques)"""
+    huella = hashlib.sha1()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(2 ** 20), b''):
+            huella.update(bloque)
+    return huella.hexdigest()
+
+
+def separador_csv(ruta):
+    """',' o ';' según la cabecera del CSV"""
+    with open(ruta, encoding='utf-8') as f:
+        cabecera = f.readline()
+    return ';' if cabecera.count(';') > cabecera.count(',') else ','
+
+
+def _leer_csv(ruta):
+    """CSV separado por ',' o ';' con los factores como categorías"""
+    tipos = {col: 'category' for col in COLUMNAS_FACTORES}
+    return pd.read_csv(ruta, sep=separador_csv(ruta), dtype=tipos)
+
+
+def ruta_cache(ruta, formato='parquet'):
+    """Ruta de la copia columnar de `ruta`"""
+    directorio, nombre = os.path.split(os.path.abspath(ruta))
+    return os.path.join(directorio, DIRECTORIO_CACHE, f'{nombre}.{formato}')
+
+
+def _leer_copia(ruta, formato):
+    """(df, metadatos de origen) de una copia columnar, o (None, None) si no sirve"""
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    try:
+        tabla = pq.read_table(ruta) if formato == 'parquet' else feather.read_table(ruta)
+        origen = json.loads((tabla.schema.metadata or {}).get(_CLAVE_ORIGEN, b'null'))
+    except (OSError, ValueError):
+        # Copia dañada o a medio escribir por otra versión: se regenera
+        return None, None
+    if not origen or origen.get('version') != VERSION_CACHE:
+        return None, None
+    return tabla, origen
+
+
+def _escribir_copia(df, ruta, formato, origen):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    tabla = tabla.replace_schema_metadata({**tabla.schema.metadata,
+                                           _CLAVE_ORIGEN: json.dumps(origen).encode('utf-8')})
+    directorio = os.path.dirname(ruta)
+    os.makedirs(directorio, exist_ok=True)
+    # Escritura atómica: otro proceso nunca lee una copia a medio escribir
+    fd, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    os.close(fd)
+    try:
+        if formato == 'parquet':
+            pq.write_table(tabla, temporal)
+        else:
+            feather.write_feather(tabla, temporal)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def leer_tabla(ruta, cache=True, formato='parquet'):
+    """
+    Lee un ensayo con los tipos de columna ya resueltos (factores como
+    categorías). Los Parquet y Feather se leen directamente; un CSV se lee
+    desde su copia columnar (`formato`: 'parquet' o 'feather') si su fecha de
+    modificación y tamaño, o su sha1, coinciden con los registrados; si no,
+    se parsea y se regenera la copia. Con cache=False, o sin pyarrow o sin
+    permiso de escritura, siempre se parsea el CSV.
+    """
+    if ruta.endswith('.parquet'):
+        return pd.read_parquet(ruta)
+    if ruta.endswith('.feather'):
+        return pd.read_feather(ruta)
+    if formato not in FORMATOS_CACHE:
+        raise ValueError(f"Formato de cache desconocido: {formato} (use {' o '.join(FORMATOS_CACHE)})")
+    if not cache:
+        return _leer_csv(ruta)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return _leer_csv(ruta)
+
+    estado = os.stat(ruta)
+    copia = ruta_cache(ruta, formato)
+    tabla, origen = _leer_copia(copia, formato) if os.path.exists(copia) else (None, None)
+    if tabla is not None and origen['tamano'] == estado.st_size:
+        if origen['mtime_ns'] == estado.st_mtime_ns:
+            return tabla.to_pandas()
+        if origen['sha1'] == huella_archivo(ruta):
+            # Mismo contenido con otra fecha (copiado, checkout): se registra la nueva fecha
+            df = tabla.to_pandas()
+            origen['mtime_ns'] = estado.st_mtime_ns
+            try:
+                _escribir_copia(df, copia, formato, origen)
+            except OSError:
+                pass
+            return df
+
+    df = _leer_csv(ruta)
+    origen = {'version': VERSION_CACHE, 'mtime_ns': estado.st_mtime_ns, 'tamano': estado.st_size,
+              'sha1': huella_archivo(ruta)}
+    try:
+        _escribir_copia(df, copia, formato, origen)
+    except OSError:
+        # Directorio de sólo lectura: se trabaja sin copia
+        pass
+    return df
+
+
+def leer_datos(*rutas, columnas=(), faltantes=None, cache=True):
+    """
+    Lee el primer ensayo existente de `rutas` (leer_tabla) con los nombres
+    resueltos por resolver_esquema (las `columnas` que usa quien llama, en
+    cualquiera de sus variantes) y los factores según el esquema
+    (como_factores). Si se indica `faltantes`, los niveles vacíos de los
+    factores sin nivel por defecto se reemplazan por ese texto. Devuelve
+    (df, ruta) o lanza FileNotFoundError si no existe ninguna.
+    """
+    for ruta in rutas:
+        if os.path.exists(ruta):
+            break
+    else:
+        raise FileNotFoundError(f"No se encontró ninguno de: {', '.join(rutas)}")
+    return como_factores(resolver_esquema(leer_tabla(ruta, cache), columnas), faltantes), ruta
+
+
+@lru_cache(maxsize=None)
+def alias_esquema(ruta=TRADUCCION_QUINUA):
+    """
+    Alias del esquema desde un archivo de traducciones: (columnas, niveles)
+    con nombre → nombre canónico y factor canónico → {nivel: nivel canónico}.
+    Lo canónico es la traducción 'es' (o el nombre original si 'es' no lo
+    cambia); son alias el nombre original y su traducción en cada idioma.
+    """
+    with open(ruta, encoding='utf-8') as f:
+        idiomas = json.load(f)['idiomas']
+    es = idiomas.get('es', {})
+    columnas_es, niveles_es = es.get('columnas', {}), es.get('niveles', {})
+    columnas, niveles = {}, {}
+    for tablas in idiomas.values():
+        for original, traducido in tablas.get('columnas', {}).items():
+            columnas[original] = columnas[traducido] = columnas_es.get(original, original)
+        for factor, mapa in tablas.get('niveles', {}).items():
+            destino = niveles.setdefault(columnas_es.get(factor, factor), {})
+            for original, traducido in mapa.items():
+                destino[original] = destino[traducido] = niveles_es.get(factor, {}).get(original, original)
+    return columnas, niveles
+
+
+def renombrar_niveles(serie, mapa):
+    """
+    Traduce los niveles de una Series categórica: el costo depende del número
+    de niveles, no de filas. Niveles con la misma traducción se funden en uno.
+    """
+    traducidas = pd.Index([mapa.get(nivel, nivel) for nivel in serie.cat.categories])
+    if traducidas.is_unique:
+        return serie.cat.rename_categories(traducidas)
+    unicas = traducidas.unique()
+    # Código viejo → código nuevo; sólo se reindexan los códigos (enteros chicos)
+    codigos = serie.cat.codes.to_numpy()
+    nuevos = np.where(codigos >= 0, unicas.get_indexer(traducidas)[np.maximum(codigos, 0)], -1)
+    return pd.Series(pd.Categorical.from_codes(nuevos, unicas), index=serie.index, name=serie.name)
+
+
+def renombres_esquema(disponibles, columnas=(), ruta=TRADUCCION_QUINUA):
+    """
+    {nombre en `disponibles`: nombre pedido} para los factores y cada columna
+    de `columnas` (los nombres que usa quien llama) que en `disponibles`
+    aparece con uno de sus alias (Lluvia_mm → Precipitacion_mm, Dias_Cosecha
+    → Dias_cosecha, ...).
+    """
+    alias_columnas = alias_esquema(ruta)[0]
+    pedidas = {col: col for col in COLUMNAS_FACTORES}
+    pedidas.update({alias_columnas.get(col, col): col for col in columnas})
+    disponibles = list(disponibles)
+    renombres = {}
+    for col in disponibles:
+        destino = pedidas.get(alias_columnas.get(col, col))
+        if destino is not None and destino != col and destino not in disponibles:
+            renombres[col] = destino
+    return renombres
+
+
+def niveles_esquema(serie, ruta=TRADUCCION_QUINUA):
+    """Factor `serie` (categórico) con los niveles del esquema desde cualquiera de sus alias (Low → Bajo)"""
+    mapa = alias_esquema(ruta)[1].get(serie.name)
+    if not mapa:
+        return serie
+    serie = serie if isinstance(serie.dtype, pd.CategoricalDtype) else serie.astype('category')
+    return renombrar_niveles(serie, mapa)
+
+
+def resolver_esquema(df, columnas=(), ruta=TRADUCCION_QUINUA):
+    """
+    Nombres del esquema en `df` sin copiar datos: los factores y cada columna
+    de `columnas` se renombran desde cualquiera de sus alias
+    (renombres_esquema) y los niveles de los factores se llevan a los del
+    esquema renombrando categorías (niveles_esquema). El resto queda igual.
+    """
+    # Con copy-on-write, rename sólo cambia las etiquetas: las columnas son las mismas
+    df = df.rename(columns=renombres_esquema(df.columns, columnas, ruta))
+    for factor in alias_esquema(ruta)[1]:
+        if factor in df:
+            df[factor] = niveles_esquema(df[factor], ruta)
+    return df
+
+
+def niveles_factor(columna, observados):
+    """Niveles `observados` de `columna` en el orden del esquema; los desconocidos, al final y ordenados"""
+    esquema = NIVELES_FACTORES.get(columna, [])
+    observados = set(observados)
+    return [nivel for nivel in esquema if nivel in observados] + sorted(observados.difference(esquema))
+
+
+def como_factor(serie, faltantes=None):
+    """Factor `serie` como Categorical ordenado según el esquema (niveles vacíos → NIVEL_FALTANTE)"""
+    categorica = isinstance(serie.dtype, pd.CategoricalDtype)
+    observados = list(serie.cat.categories if categorica else serie.dropna().unique())
+    faltante = NIVEL_FALTANTE.get(serie.name, faltantes) if serie.hasnans else None
+    niveles = niveles_factor(serie.name, observados + ([faltante] if faltante is not None else []))
+    # Con categorías sólo se reordenan los códigos: el texto se compara una vez por nivel
+    factor = (serie.cat.set_categories(niveles, ordered=True) if categorica
+              else serie.astype(pd.CategoricalDtype(niveles, ordered=True)))
+    return factor if faltante is None else factor.fillna(faltante)
+
+
+def codigo_tratamiento(df, factores=FACTORES_TRATAMIENTO):
+    """Código entero del tratamiento (base mixta de los códigos de `factores`; -1 si falta alguno)"""
+    codigo = np.zeros(len(df), dtype=np.int64)
+    for col in factores:
+        codigos = df[col].cat.codes.to_numpy()
+        codigo = np.where((codigo < 0) | (codigos < 0), -1, codigo * len(df[col].cat.categories) + codigos)
+    return codigo
+
+
+def columna_tratamiento(df, factores=FACTORES_TRATAMIENTO, separador='_'):
+    """
+    Tratamiento como Categorical ordenado: los códigos son el código de
+    tratamiento compactado a las combinaciones observadas y las categorías
+    sus etiquetas (niveles unidos por `separador`).
+    """
+    codigo = codigo_tratamiento(df, factores)
+    total = int(np.prod([len(df[col].cat.categories) for col in factores]))
+    # Compactar con un conteo (O(n)): conserva el orden de los niveles
+    presentes = np.flatnonzero(np.bincount(codigo[codigo >= 0], minlength=total))
+    mapa = np.full(total + 1, -1, dtype=np.int64)
+    mapa[presentes] = np.arange(len(presentes))
+    partes, resto = [], presentes
+    for col in reversed(factores):
+        niveles = np.asarray(df[col].cat.categories, dtype=object)
+        partes.append(niveles[resto % len(niveles)])
+        resto = resto // len(niveles)
+    etiquetas = [separador.join(map(str, nivel)) for nivel in zip(*reversed(partes))]
+    return pd.Categorical.from_codes(mapa[codigo], dtype=pd.CategoricalDtype(etiquetas, ordered=True))
+
+
+def como_factores(df, faltantes=None):
+    """Aplica el esquema a los factores de `df` y deriva el Tratamiento si están los tres factores"""
+    for col in COLUMNAS_FACTORES:
+        if col in df:
+            df[col] = como_factor(df[col], faltantes)
+    if all(col in df for col in FACTORES_TRATAMIENTO):
+        df['Tratamiento'] = columna_tratamiento(df)
+    return df
+
+
+def variables_numericas(df):
+    """Rasgos numéricos de `df` (excluye factores y columnas del diseño)"""
+    excluidas = set(COLUMNAS_FACTORES + COLUMNAS_DISENO)
+    return [col for col in df.select_dtypes('number').columns if col not in excluidas]
+
+
+class EscritorTabla:
+    """Escritura incremental de una tabla en CSV o Parquet (según la extensión de `salida`)"""
+
+    def __init__(self, salida):
+        self.salida = salida
+        self.parquet = salida.endswith('.parquet')
+        self._escritor = None
+        self._primero = True
+        if os.path.exists(salida):
+            os.remove(salida)
+
+    def escribir(self, tabla):
+        """Agrega `tabla` (DataFrame, o texto CSV ya formateado con el encabezado sólo en la primera parte)"""
+        if isinstance(tabla, str):
+            with open(self.salida, 'a', encoding='utf-8', newline='') as f:
+                f.write(tabla)
+        elif self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            lote = pa.Table.from_pandas(tabla, preserve_index=False)
+            if self._escritor is None:
+                self._escritor = pq.ParquetWriter(self.salida, lote.schema)
+            self._escritor.write_table(lote.cast(self._escritor.schema))
+        else:
+            tabla.to_csv(self.salida, mode='a', header=self._primero, index=False)
+        self._primero = False
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
@@ -0,0 +1,239 @@
+"""
+Disposiciones de campo A- y D-óptimas en bloques
+Busca la asignación de tratamientos a parcelas dentro de bloques de tamaños
+dados (completos o incompletos, p. ej. cientos de entradas en bloques de
+15 parcelas) que optimiza la información sobre los contrastes de
+tratamientos en el modelo y = bloque + tratamiento, y devuelve el plano de
+campo con el orden de las parcelas aleatorizado dentro de cada bloque.
+
+La matriz de información ajustada por bloques es C = R - N K⁻¹ Nᵀ (R:
+réplicas por tratamiento, N: incidencia tratamiento × bloque, K: tamaños de
+bloque). Intercambiar el tratamiento i del bloque a con el j del bloque b
+cambia C en un término simétrico de rango 2, w dᵀ + d wᵀ con d = e_j - e_i,
+así que con G = (C + J/t)⁻¹ el cociente de determinantes (criterio D) y el
+cambio en la traza de la inversa (criterio A) de cada intercambio salen de
+unos pocos elementos de G, G² y G N K⁻¹ (lema del determinante y fórmula de
+Woodbury): todos los intercambios candidatos se evalúan a la vez sin
+reajustar el modelo, y sólo el intercambio aceptado actualiza G.
+"""
+
+import numpy as np
+import pandas as pd
+
+TOLERANCIA = 1e-9
+
+
+def _informacion(tratamiento, bloque, n_tratamientos, tamanos):
+    """(N, C): incidencia tratamiento × bloque y matriz de información ajustada por bloques"""
+    N = np.zeros((n_tratamientos, len(tamanos)))
+    np.add.at(N, (tratamiento, bloque), 1)
+    return N, np.diag(N.sum(axis=1)) - (N / tamanos) @ N.T
+
+
+def eficiencias(tratamiento, bloque, n_tratamientos, tamanos):
+    """
+    Factores de eficiencia A y D (medias armónica y geométrica de los
+    autovalores no nulos de R^-1/2 C R^-1/2): 1 en un diseño ortogonal;
+    0 si algún contraste no es estimable.
+    """
+    N, C = _informacion(tratamiento, bloque, n_tratamientos, np.asarray(tamanos, dtype=float))
+    escala = 1 / np.sqrt(N.sum(axis=1))
+    autovalores = np.linalg.eigvalsh(escala[:, None] * C * escala[None, :])[1:]
+    if autovalores.min() <= TOLERANCIA:
+        return 0.0, 0.0
+    return len(autovalores) / (1 / autovalores).sum(), float(np.exp(np.log(autovalores).mean()))
+
+
+class _Intercambios:
+    """Estado de la búsqueda: incidencia, G = (C + J/t)⁻¹ y los productos que usan los puntajes"""
+
+    def __init__(self, tratamiento, bloque, n_tratamientos, tamanos):
+        self.tratamiento = tratamiento
+        self.bloque = bloque
+        self.t = n_tratamientos
+        self.k = tamanos
+        # Pares de parcelas en bloques distintos: los únicos intercambios que cambian C
+        p, q = np.triu_indices(len(bloque), 1)
+        distintos = bloque[p] != bloque[q]
+        self.p, self.q = p[distintos], q[distintos]
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Recalcula G desde cero (al inicio y periódicamente, para no acumular error)"""
+        self.N, C = _informacion(self.tratamiento, self.bloque, self.t, self.k)
+        self.G = np.linalg.inv(C + 1 / self.t)
+        self._productos()
+
+    def _productos(self):
+        self.G2 = self.G @ self.G
+        NK = self.N / self.k
+        self.H, self.H2 = self.G @ NK, self.G2 @ NK
+        self.L, self.L2 = NK.T @ self.H, NK.T @ self.H2
+
+    def _terminos(self, p, q):
+        """Escalares de cada intercambio (p, q) para el lema del determinante y Woodbury"""
+        i, j = self.tratamiento[p], self.tratamiento[q]
+        a, b = self.bloque[p], self.bloque[q]
+        c = 1 / self.k[a] + 1 / self.k[b]
+        G, G2, H, H2, L, L2 = self.G, self.G2, self.H, self.H2, self.L, self.L2
+        dGd = G[j, j] + G[i, i] - 2 * G[i, j]
+        dGu = (H[j, a] - H[j, b]) - (H[i, a] - H[i, b])
+        uGu = L[a, a] + L[b, b] - 2 * L[a, b]
+        # S = I - Vᵀ G U con U = [w, d], V = [d, w], w = u + c d / 2
+        s11 = 1 - (dGu + c / 2 * dGd)
+        e = uGu + c * dGu + c * c / 4 * dGd
+        det = s11 * s11 - dGd * e
+        return i, j, a, b, c, dGd, dGu, uGu, s11, e, det
+
+    def puntajes(self, criterio):
+        """
+        Mejora de cada intercambio candidato: log det(C')/det(C) para 'D',
+        reducción de la traza de C⁺ para 'A' (> 0 mejora; -inf si desconecta)
+        """
+        cambia = self.tratamiento[self.p] != self.tratamiento[self.q]
+        p, q = self.p[cambia], self.q[cambia]
+        i, j, a, b, c, dGd, dGu, uGu, s11, e, det = self._terminos(p, q)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if criterio == 'D':
+                puntaje = np.log(np.where(det > TOLERANCIA, det, np.nan))
+            else:
+                pp = self.G2[j, j] + self.G2[i, i] - 2 * self.G2[i, j]
+                pg = (self.H2[j, a] - self.H2[j, b]) - (self.H2[i, a] - self.H2[i, b])
+                gg = self.L2[a, a] + self.L2[b, b] - 2 * self.L2[a, b]
+                pq = pg + c / 2 * pp
+                qq = gg + c * pg + c * c / 4 * pp
+                puntaje = -(2 * s11 * pq + dGd * qq + e * pp) / np.where(det > TOLERANCIA, det, np.nan)
+        return p, q, np.nan_to_num(puntaje, nan=-np.inf)
+
+    def aplicar(self, p, q):
+        """Intercambia los tratamientos de las parcelas p y q y actualiza G (Woodbury, rango 2)"""
+        i, j, a, b, c, dGd, dGu, uGu, s11, e, det = self._terminos(p, q)
+        d = np.zeros(self.t)
+        d[j] += 1
+        d[i] -= 1
+        w = (self.N[:, a] / self.k[a] - self.N[:, b] / self.k[b]) + c / 2 * d
+        GU = np.column_stack([self.G @ w, self.G @ d])
+        S = np.array([[s11, -dGd], [-e, s11]])
+        self.G += GU @ np.linalg.solve(S, GU[:, ::-1].T)
+        self.N[i, a] -= 1
+        self.N[j, a] += 1
+        self.N[i, b] += 1
+        self.N[j, b] -= 1
+        self.tratamiento[p], self.tratamiento[q] = j, i
+        self._productos()
+
+
+def _inicial(tamanos, replicas, rng):
+    """Asignación aleatoria: cada tratamiento con sus réplicas, repartido al azar entre parcelas"""
+    tratamiento = rng.permutation(np.repeat(np.arange(len(replicas)), replicas))
+    return tratamiento, np.repeat(np.arange(len(tamanos)), tamanos)
+
+
+def optimizar_disposicion(tamanos, n_tratamientos, replicas=None, criterio='A', inicios=5,
+                          semilla=42, max_intercambios=None):
+    """
+    Asignación de `n_tratamientos` a las parcelas de bloques de `tamanos`
+    (réplicas por tratamiento lo más parejas posible, o `replicas`) que
+    optimiza el criterio 'A' o 'D', por intercambios de mayor mejora desde
+    `inicios` asignaciones aleatorias. Devuelve (tratamiento, bloque) por
+    parcela, con las parcelas de cada bloque contiguas.
+    """
+    if criterio not in ('A', 'D'):
+        raise ValueError(f"Criterio desconocido: {criterio} (use 'A' o 'D')")
+    tamanos = np.asarray(tamanos, dtype=np.int64)
+    n = int(tamanos.sum())
+    if replicas is None:
+        replicas = (np.full(n_tratamientos, n // n_tratamientos)
+                    + (np.arange(n_tratamientos) < n % n_tratamientos))
+    replicas = np.asarray(replicas, dtype=np.int64)
+    if replicas.sum() != n or (replicas < 1).any():
+        raise ValueError(f"Las réplicas ({replicas.sum()}) deben sumar las {n} parcelas")
+    max_intercambios = max_intercambios or 10 * n
+    rng = np.random.default_rng(semilla)
+
+    mejor, mejor_valor = None, -np.inf
+    for _ in range(inicios):
+        tratamiento, bloque = _inicial(tamanos, replicas, rng)
+        for _ in range(100):
+            # Sólo se parte de diseños conexos (todos los contrastes estimables)
+            if eficiencias(tratamiento, bloque, n_tratamientos, tamanos)[0] > 0:
+                break
+            tratamiento = rng.permutation(tratamiento)
+        else:
+            raise ValueError("No se encontró una asignación conexa para esos tamaños de bloque")
+        estado = _Intercambios(tratamiento, bloque, n_tratamientos, tamanos.astype(float))
+        for paso in range(1, max_intercambios + 1):
+            p, q, puntaje = estado.puntajes(criterio)
+            if len(puntaje) == 0 or puntaje.max() <= TOLERANCIA:
+                break
+            mejor_par = np.argmax(puntaje)
+            estado.aplicar(p[mejor_par], q[mejor_par])
+            if paso % 200 == 0:
+                estado.reiniciar()
+        valor = eficiencias(estado.tratamiento, bloque, n_tratamientos, tamanos)['AD'.index(criterio)]
+        if valor > mejor_valor:
+            mejor, mejor_valor = (estado.tratamiento.copy(), bloque), valor
+    return mejor
+
+
+def plano_campo(tratamiento, bloque, nombres, semilla=42, nombres_bloque=None):
+    """
+    Plano de campo: orden de parcelas aleatorizado dentro de cada bloque
+    (Parcela 1, 2, ... del bloque), PlotID correlativo y tratamiento.
+    """
+    rng = np.random.default_rng(semilla)
+    orden = np.concatenate([rng.permutation(np.flatnonzero(bloque == b)) for b in np.unique(bloque)])
+    bloque, tratamiento = bloque[orden], tratamiento[orden]
+    nombres_bloque = nombres_bloque or [f'Bloque{b + 1}' for b in range(bloque.max() + 1)]
+    inicio = np.searchsorted(bloque, bloque)
+    return pd.DataFrame({
+        'PlotID': [f'P{i:03d}' for i in range(1, len(bloque) + 1)],
+        'Bloque': np.asarray(nombres_bloque)[bloque],
+        'Parcela': np.arange(len(bloque)) - inicio + 1,
+        'Tratamiento': np.asarray(nombres)[tratamiento],
+    })
+
+
+def ejecutar_disposicion(salida='disposicion_campo.csv', diseno=None, n_tratamientos=None, tamanos=None,
+                         criterio='A', inicios=5, semilla=42):
+    """
+    Optimiza la disposición para los tratamientos de la especificación
+    `diseno` (bloques con sus réplicas) o para `n_tratamientos` entradas
+    T001, T002, ... en bloques de `tamanos`, imprime su eficiencia frente a
+    la asignación en orden fijo y guarda el plano aleatorizado en `salida`.
+    """
+    from .simulacion import DISENO_QUINUA, leer_diseno
+
+    especificacion = None
+    if n_tratamientos is None:
+        especificacion = leer_diseno(diseno or DISENO_QUINUA)
+        nombres = especificacion.tratamientos()
+        if tamanos is None:
+            tamanos = len(nombres) * especificacion.replicas()
+    else:
+        nombres = [f'T{i:03d}' for i in range(1, n_tratamientos + 1)]
+        if tamanos is None:
+            raise ValueError("Con un número de tratamientos hay que indicar los tamaños de bloque")
+    tamanos = np.asarray(tamanos, dtype=np.int64)
+    t = len(nombres)
+
+    tratamiento, bloque = optimizar_disposicion(tamanos, t, criterio=criterio, inicios=inicios,
+                                                semilla=semilla)
+    fijo = np.arange(tamanos.sum()) % t
+    print(f"Disposición {criterio}-óptima: {t} tratamientos en {len(tamanos)} bloques "
+          f"de {'/'.join(map(str, tamanos))} parcelas")
+    for etiqueta, asignacion in [('Orden fijo', fijo), ('Optimizada', tratamiento)]:
+        a, d = eficiencias(asignacion, bloque, t, tamanos)
+        print(f"  {etiqueta:<12} eficiencia A = {a:.4f}  |  eficiencia D = {d:.4f}")
+
+    nombres_bloque = None
+    if especificacion is not None and len(tamanos) == len(especificacion.bloques):
+        nombres_bloque = list(especificacion.bloques)
+    plano = plano_campo(tratamiento, bloque, nombres, semilla, nombres_bloque)
+    if especificacion is not None:
+        niveles = plano['Tratamiento'].str.split('_', expand=True)
+        for k, factor in enumerate(especificacion.factores):
+            plano[factor] = niveles[k]
+    plano.to_csv(salida, index=False)
+    print(f"✓ Plano de campo aleatorizado guardado en: {salida}")
+    return plano
@@ -0,0 +1,202 @@
+"""
+Renderizado de figuras sin pantalla
+Cada figura se describe con una función que la dibuja y devuelve (sin
+guardarla ni mostrarla). En modo sin pantalla se fuerza el backend Agg,
+nunca se llama a show() y las figuras se dibujan y guardan en paralelo en un
+pool de procesos, una por proceso. El resultado es un reporte de tiempos por
+figura (dibujo, guardado y total).
+
+Con un CacheFiguras, cada figura que declara sus `insumos` (los datos que
+dibuja) se direcciona por contenido: hash de los insumos, de la
+especificación (función, argumentos simples, dpi), del código del paquete y
+de las versiones de matplotlib/seaborn. Si la clave ya está en el cache, el
+PNG se copia en lugar de volver a dibujarse.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from functools import lru_cache
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+@dataclass
+class Figura:
+    """Figura a renderizar: `funcion(*argumentos)` devuelve la figura de matplotlib"""
+    nombre: str
+    funcion: object
+    argumentos: tuple
+    salida: str
+    dpi: int = 300
+    insumos: tuple = None  # datos de los que depende la figura; None = no se cachea
+
+
+@lru_cache(maxsize=None)
+def _huella_entorno():
+    """Huella del código del paquete y de las versiones de las librerías de gráficos"""
+    huella = hashlib.sha1()
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    for nombre in sorted(os.listdir(directorio)):
+        if nombre.endswith('.py'):
+            with open(os.path.join(directorio, nombre), 'rb') as f:
+                huella.update(f.read())
+    for paquete in ('matplotlib', 'seaborn'):
+        try:
+            huella.update(f'{paquete}={metadata.version(paquete)}'.encode('utf-8'))
+        except metadata.PackageNotFoundError:
+            pass
+    return huella.hexdigest()
+
+
+def _simple(valor):
+    return valor is None or isinstance(valor, (str, int, float, bool)) or (
+        isinstance(valor, tuple) and all(map(_simple, valor)))
+
+
+def clave_figura(figura):
+    """Clave por contenido de `figura` (None si no declara sus insumos)"""
+    if figura.insumos is None:
+        return None
+    huella = hashlib.sha1(_huella_entorno().encode('utf-8'))
+    funcion = f'{figura.funcion.__module__}.{figura.funcion.__qualname__}'
+    # Los argumentos no simples (índices, modelos) se representan por sus insumos
+    argumentos = [repr(a) if _simple(a) else type(a).__name__ for a in figura.argumentos]
+    huella.update(repr((funcion, argumentos, figura.dpi)).encode('utf-8'))
+    for insumo in figura.insumos:
+        if isinstance(insumo, (pd.DataFrame, pd.Series)):
+            huella.update(repr(list(insumo.columns) if isinstance(insumo, pd.DataFrame)
+                               else insumo.name).encode('utf-8'))
+            huella.update(pd.util.hash_pandas_object(insumo, index=True).to_numpy().tobytes())
+        else:
+            huella.update(repr(insumo).encode('utf-8'))
+    return huella.hexdigest()
+
+
+class CacheFiguras:
+    """
+    Cache en disco de PNG direccionado por contenido. Al superar `max_bytes`
+    se desalojan los archivos usados hace más tiempo (fecha de modificación,
+    que se renueva en cada acierto).
+    """
+
+    def __init__(self, directorio='cache_figuras', max_bytes=256 * 2 ** 20):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f'{clave}.png')
+
+    def recuperar(self, clave, salida):
+        """Copia la figura de `clave` a `salida`; False si no está en el cache"""
+        try:
+            shutil.copyfile(self._ruta(clave), salida)
+            os.utime(self._ruta(clave))
+        except OSError:
+            self.fallos += 1
+            return False
+        self.aciertos += 1
+        return True
+
+    def guardar(self, clave, archivo):
+        """Agrega `archivo` bajo `clave` y desaloja hasta respetar `max_bytes`"""
+        # Escritura atómica: otro proceso nunca lee un archivo a medio escribir
+        fd, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(archivo, temporal)
+        os.replace(temporal, self._ruta(clave))
+        self._desalojar()
+
+    def _desalojar(self):
+        entradas = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith('.png'):
+                estado = os.stat(os.path.join(self.directorio, nombre))
+                entradas.append((estado.st_mtime, estado.st_size, nombre))
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, nombre in sorted(entradas)[:-1]:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directorio, nombre))
+            total -= tamano
+
+
+def usar_agg():
+    """Fuerza el backend Agg (sin pantalla) antes de importar pyplot"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def _renderizar(figura, cerrar=True):
+    import matplotlib.pyplot as plt
+
+    inicio = time.perf_counter()
+    fig = figura.funcion(*figura.argumentos)
+    dibujada = time.perf_counter()
+    fig.savefig(figura.salida, dpi=figura.dpi, bbox_inches='tight')
+    guardada = time.perf_counter()
+    if cerrar:
+        plt.close(fig)
+    return figura.nombre, figura.salida, dibujada - inicio, guardada - dibujada
+
+
+def _renderizar_sin_pantalla(figura):
+    """Tarea del pool: cada proceso usa su propio backend Agg"""
+    usar_agg()
+    return _renderizar(figura)
+
+
+def renderizar_figuras(figuras, procesos=None, mostrar=False, cache=None):
+    """
+    Dibuja y guarda `figuras`. Sin `mostrar`, usa Agg y un pool de hasta
+    `procesos` procesos (por defecto uno por figura, acotado por los CPU);
+    con un `cache` (CacheFiguras), las figuras sin cambios se copian desde él
+    y sólo se dibujan las demás. Con `mostrar`, las dibuja en este proceso y
+    las deja abiertas para show(). Devuelve la tabla de tiempos (segundos)
+    por figura.
+    """
+    if mostrar:
+        filas = [_renderizar(figura, cerrar=False) for figura in figuras]
+    else:
+        filas, pendientes, claves = {}, [], {}
+        for figura in figuras:
+            inicio = time.perf_counter()
+            clave = clave_figura(figura) if cache is not None else None
+            if clave is not None and cache.recuperar(clave, figura.salida):
+                filas[figura.nombre] = (figura.nombre, figura.salida, 0.0,
+                                        time.perf_counter() - inicio)
+            else:
+                pendientes.append(figura)
+                claves[figura.nombre] = clave
+        procesos = min(procesos or os.cpu_count() or 1, max(len(pendientes), 1))
+        if procesos <= 1:
+            dibujadas = [_renderizar_sin_pantalla(figura) for figura in pendientes]
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                dibujadas = list(pool.map(_renderizar_sin_pantalla, pendientes))
+        for fila in dibujadas:
+            filas[fila[0]] = fila
+            if claves[fila[0]] is not None:
+                cache.guardar(claves[fila[0]], fila[1])
+        filas = [filas[figura.nombre] for figura in figuras]
+    tiempos = pd.DataFrame(filas, columns=['figura', 'archivo', 'dibujo_s', 'guardado_s'])
+    tiempos['total_s'] = tiempos['dibujo_s'] + tiempos['guardado_s']
+    if cache is not None and not mostrar:
+        tiempos['cache'] = [figura.nombre not in claves for figura in figuras]
+    return tiempos.set_index('figura')
+
+
+def imprimir_tiempos(tiempos, transcurrido):
+    """Reporte de tiempos por figura y tiempo real total del renderizado"""
+    print("\nTiempos de renderizado (s):")
+    print(tiempos.round(2).to_string())
+    print(f"  Tiempo real total: {transcurrido:.2f} s "
+          f"(suma por figura: {tiempos['total_s'].sum():.2f} s)")
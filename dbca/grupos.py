@@ -0,0 +1,251 @@
+"""
+Índice agrupado de un dataset para gráficos y estadísticas descriptivas
+Cada columna de factores se factoriza una sola vez (los factores del esquema de
+dbca.datos ya traen sus códigos en el orden de los niveles) y cada
+agrupación (un factor o una combinación de factores) se codifica con un
+código entero por fila. Cada variable se ordena una sola vez por valor; para
+cada agrupación basta un ordenamiento estable por código de grupo (radix
+sort sobre enteros pequeños, O(n)) para dejar los valores de cada grupo
+contiguos y ordenados: los datos de cada caja de un boxplot son vistas
+(slices) de ese arreglo y los cuantiles salen por posición, sin recorrer el
+DataFrame una vez por nivel.
+
+describir_conjuntos calcula describe() de varias variables para una lista de
+conjuntos de agrupación (p. ej. cubo() o rollup() de los factores, como
+GROUPING SETS en SQL) y lo devuelve en una sola tabla larga.
+"""
+
+from dataclasses import dataclass
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_DESCRIBE = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def cubo(factores):
+    """Conjuntos de agrupación de CUBE: todos los subconjuntos, del más fino al total ()"""
+    return [c for r in range(len(factores), -1, -1) for c in combinations(factores, r)]
+
+
+def rollup(factores):
+    """Conjuntos de agrupación de ROLLUP: prefijos de `factores`, del más fino al total ()"""
+    return [tuple(factores[:r]) for r in range(len(factores), -1, -1)]
+
+
+def _describe_grupos(ordenados, limites):
+    """Columnas de describe() a partir de los valores ordenados por grupo y sus límites"""
+    n = np.diff(limites)
+    inicio = limites[:-1]
+    ocupados = n > 0
+    suma = np.zeros(len(n))
+    suma[ocupados] = np.add.reduceat(ordenados, inicio[ocupados]) if len(ordenados) else 0.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = suma / n
+        cuadrados = np.zeros(len(n))
+        if len(ordenados):
+            desvios = ordenados - np.repeat(media, n)
+            cuadrados[ocupados] = np.add.reduceat(desvios * desvios, inicio[ocupados])
+        desv = np.sqrt(cuadrados / (n - 1))
+    tabla = {'count': n.astype(float), 'mean': media, 'std': desv}
+    for nombre, q in [('min', 0.0), ('25%', 0.25), ('50%', 0.5), ('75%', 0.75), ('max', 1.0)]:
+        # Interpolación lineal entre estadísticos de orden (como numpy/pandas)
+        posicion = inicio + (n - 1) * q
+        bajo = np.floor(posicion).astype(np.int64)
+        alto = np.ceil(posicion).astype(np.int64)
+        columna = np.full(len(n), np.nan)
+        columna[ocupados] = (ordenados[bajo[ocupados]] + (posicion - bajo)[ocupados]
+                             * (ordenados[alto[ocupados]] - ordenados[bajo[ocupados]]))
+        tabla[nombre] = columna
+    return tabla
+
+
+@dataclass
+class Agrupacion:
+    """Código de grupo por fila (-1 si falta algún factor) y claves de los grupos observados"""
+    columnas: tuple
+    codigos: np.ndarray
+    claves: pd.Index
+
+    def __post_init__(self):
+        # Copia en el entero más chico posible: menos memoria que mover al ordenar
+        self.compactos = self.codigos.astype(np.int16 if self.n_grupos < 2 ** 15 else np.int64)
+
+    @property
+    def n_grupos(self):
+        return len(self.claves)
+
+
+class IndiceGrupos:
+    """
+    Índice agrupado de `df`, construido una vez por dataset. Las agrupaciones
+    y los valores ordenados por grupo se calculan al primer uso y se reutilizan
+    en todos los paneles y tablas.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._factores = {}
+        self._agrupaciones = {}
+        self._por_valor = {}
+        self._valores = {}
+
+    def _factorizar(self, columna):
+        if columna not in self._factores:
+            serie = self.df[columna]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                # Factor del esquema: sus códigos ya están en el orden de los niveles
+                codigos = serie.cat.codes.to_numpy().astype(np.int64)
+                presentes = np.flatnonzero(np.bincount(codigos[codigos >= 0],
+                                                       minlength=len(serie.cat.categories)))
+                mapa = np.full(len(serie.cat.categories) + 1, -1, dtype=np.int64)
+                mapa[presentes] = np.arange(len(presentes))
+                self._factores[columna] = (mapa[codigos], pd.Index(serie.cat.categories[presentes]))
+            else:
+                self._factores[columna] = pd.factorize(serie, sort=True)
+        return self._factores[columna]
+
+    def niveles(self, columna):
+        """Niveles observados de `columna`, en el orden del factor (alfabético si es texto)"""
+        return list(self._factorizar(columna)[1])
+
+    def agrupacion(self, columnas):
+        """Agrupación por una columna o una lista de columnas (orden lexicográfico por niveles)"""
+        columnas = (columnas,) if isinstance(columnas, str) else tuple(columnas)
+        if columnas not in self._agrupaciones:
+            combinado = np.zeros(len(self.df), dtype=np.int64)
+            validas = np.ones(len(self.df), dtype=bool)
+            for col in columnas:
+                codigos, niveles = self._factorizar(col)
+                combinado = combinado * len(niveles) + codigos
+                validas &= codigos >= 0
+            total = int(np.prod([len(self._factorizar(col)[1]) for col in columnas]))
+            if total <= 4 * len(self.df) + 1024:
+                # Compactar los códigos combinados con un conteo (O(n)) en lugar de np.unique
+                presentes = np.flatnonzero(np.bincount(combinado[validas], minlength=total))
+                mapa = np.full(total, -1, dtype=np.int64)
+                mapa[presentes] = np.arange(len(presentes))
+                codigos = mapa[combinado[validas]]
+            else:
+                presentes, codigos = np.unique(combinado[validas], return_inverse=True)
+            por_fila = np.full(len(self.df), -1, dtype=np.int64)
+            por_fila[validas] = codigos
+
+            # Decodificar los códigos combinados presentes en los códigos de cada nivel
+            partes, resto = [], presentes
+            for col in reversed(columnas):
+                niveles = self._factorizar(col)[1]
+                partes.append(resto % len(niveles))
+                resto = resto // len(niveles)
+            partes.reverse()
+            niveles = [self._factorizar(col)[1] for col in columnas]
+            if not columnas:
+                claves = pd.Index(['Total'])
+            elif len(columnas) == 1:
+                claves = pd.Index(niveles[0][partes[0]], name=columnas[0])
+            else:
+                # Niveles explícitos: unstack() y los gráficos conservan el orden del factor
+                claves = pd.MultiIndex(levels=niveles, codes=partes, names=list(columnas))
+            self._agrupaciones[columnas] = Agrupacion(columnas, por_fila, claves)
+        return self._agrupaciones[columnas]
+
+    def _ordenar_por_valor(self, variable):
+        """(filas sin NaN ordenadas por valor, sus valores); se cachea para las columnas"""
+        if not isinstance(variable, str) or variable not in self._por_valor:
+            y = np.asarray(self.df[variable] if isinstance(variable, str) else variable, dtype=float)
+            orden = np.argsort(y, kind='stable')
+            orden = orden[~np.isnan(y[orden])]
+            resultado = (orden, y[orden])
+            if not isinstance(variable, str):
+                return resultado
+            self._por_valor[variable] = resultado
+        return self._por_valor[variable]
+
+    def _ordenar(self, variable, agrupacion):
+        """Valores sin NaN ordenados por (grupo, valor) y límites de cada grupo"""
+        filas, y = self._ordenar_por_valor(variable)
+        codigos = agrupacion.compactos[filas]
+        if (codigos < 0).any():
+            y, codigos = y[codigos >= 0], codigos[codigos >= 0]
+        # Orden estable por grupo (radix sort sobre enteros chicos): conserva el
+        # orden por valor dentro de cada grupo
+        ordenados = y[np.argsort(codigos, kind='stable')]
+        limites = np.concatenate([[0], np.cumsum(np.bincount(codigos, minlength=agrupacion.n_grupos))])
+        return ordenados, limites
+
+    def _ordenados(self, variable, columnas, cachear=True):
+        agrupacion = self.agrupacion(columnas)
+        clave = (variable, agrupacion.columnas) if isinstance(variable, str) else None
+        if clave is not None and clave in self._valores:
+            return agrupacion, self._valores[clave]
+        resultado = self._ordenar(variable, agrupacion)
+        if clave is not None and cachear:
+            self._valores[clave] = resultado
+        return agrupacion, resultado
+
+    def valores(self, variable, columnas, cachear=True):
+        """
+        (claves, lista de arreglos): valores de `variable` de cada grupo,
+        ordenados y sin NaN. `variable` es el nombre de una columna (se cachea,
+        salvo con `cachear=False`) o un arreglo alineado con las filas (p. ej.
+        residuos).
+        """
+        agrupacion, (ordenados, limites) = self._ordenados(variable, columnas, cachear)
+        return agrupacion.claves, [ordenados[a:b] for a, b in zip(limites[:-1], limites[1:])]
+
+    def conteos(self, columnas):
+        """Número de filas por grupo"""
+        agrupacion = self.agrupacion(columnas)
+        codigos = agrupacion.codigos[agrupacion.codigos >= 0]
+        return pd.Series(np.bincount(codigos, minlength=agrupacion.n_grupos),
+                         index=agrupacion.claves, name='count')
+
+    def medias(self, variables, columnas):
+        """Media por grupo de una columna (Series) o de varias (DataFrame), ignorando NaN"""
+        agrupacion = self.agrupacion(columnas)
+        validas = agrupacion.codigos >= 0
+        codigos = agrupacion.codigos[validas]
+        unica = isinstance(variables, str)
+        resultado = {}
+        for var in [variables] if unica else variables:
+            y = self.df[var].to_numpy(dtype=float)[validas]
+            presentes = ~np.isnan(y)
+            suma = np.bincount(codigos[presentes], y[presentes], agrupacion.n_grupos)
+            n = np.bincount(codigos[presentes], minlength=agrupacion.n_grupos)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                resultado[var] = suma / n
+        tabla = pd.DataFrame(resultado, index=agrupacion.claves)
+        return tabla[variables] if unica else tabla
+
+    def describir(self, variable, columnas):
+        """Equivalente a df.groupby(columnas)[variable].describe() a partir de los valores ordenados"""
+        agrupacion, (ordenados, limites) = self._ordenados(variable, columnas)
+        return pd.DataFrame(_describe_grupos(ordenados, limites), index=agrupacion.claves,
+                            columns=COLUMNAS_DESCRIBE)
+
+    def describir_conjuntos(self, variables, conjuntos):
+        """
+        describe() de cada variable de `variables` para cada conjunto de
+        agrupación de `conjuntos` (tuplas de columnas; () = total), en una
+        tabla larga: variable, conjunto, una columna por factor (None si el
+        conjunto no lo incluye) y las columnas de describe(). Cada variable se
+        ordena una sola vez; cada conjunto sólo agrega un ordenamiento estable
+        por código de grupo.
+        """
+        variables = [variables] if isinstance(variables, str) else list(variables)
+        conjuntos = [(c,) if isinstance(c, str) else tuple(c) for c in conjuntos]
+        factores = list(dict.fromkeys(col for conjunto in conjuntos for col in conjunto))
+        partes = []
+        for conjunto in conjuntos:
+            claves = self.agrupacion(conjunto).claves
+            niveles = {col: (claves if len(conjunto) == 1 else claves.get_level_values(col)).to_numpy()
+                       for col in conjunto}
+            for variable in variables:
+                # Sin cachear: un cubo de muchas variables no retiene n valores por conjunto
+                _, (ordenados, limites) = self._ordenados(variable, conjunto, cachear=False)
+                tabla = {'variable': variable, 'conjunto': ' × '.join(conjunto) or 'Total'}
+                tabla.update({col: niveles.get(col, None) for col in factores})
+                tabla.update(_describe_grupos(ordenados, limites))
+                partes.append(pd.DataFrame(tabla, index=range(len(claves))))
+        return pd.concat(partes, ignore_index=True)
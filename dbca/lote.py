@@ -0,0 +1,149 @@
+"""
+Análisis DBCA por lotes de ensayos (localidad × temporada)
+Ejecuta el pipeline de dbca.analisis (ANOVA factorial con bloques, Tukey
+y verificación de supuestos) sobre cada ensayo de un directorio o de un
+dataset particionado (p. ej. localidad=Puno/temporada=2024/datos.csv) usando
+un pool de procesos. Cada ensayo se escribe en una única tabla de resultados
+(CSV o Parquet) en cuanto termina, con un número acotado de ensayos en vuelo.
+
+Uso:
+    python -m dbca lote ensayos/ --salida resultados.parquet --procesos 8
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .anova import anova_dbca
+from .cache import CacheDisenos
+from .comparaciones import comparaciones_multiples
+from .datos import EscritorTabla, como_factores, leer_tabla, resolver_esquema
+from .permutacion import anova_permutacion
+from .supuestos import diagnosticar_supuestos
+
+FACTORES = ['Variedad', 'Fertilizante', 'Riego']
+EXTENSIONES = ('.csv', '.parquet', '.feather')
+
+COLUMNAS_RESULTADO = {
+    'ensayo': 'object',
+    'analisis': 'object',
+    'respuesta': 'object',
+    'termino': 'object',
+    'comparacion': 'object',
+    'estadistico': 'float64',
+    'gl': 'float64',
+    'p_valor': 'float64',
+}
+
+# Cache de diseños por proceso: ensayos con la misma disposición de campo la comparten
+_cache_proceso = None
+
+
+def _iniciar_proceso():
+    global _cache_proceso
+    _cache_proceso = CacheDisenos()
+
+
+def listar_ensayos(entrada):
+    """Archivos de ensayo bajo `entrada` (recursivo, orden estable) con su identificador"""
+    if os.path.isfile(entrada):
+        return [(os.path.splitext(os.path.basename(entrada))[0], entrada)]
+    ensayos = []
+    for raiz, dirs, archivos in os.walk(entrada):
+        # Directorios y archivos ocultos (p. ej. las copias de .cache_dbca) no son ensayos
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for archivo in sorted(archivos):
+            if archivo.endswith(EXTENSIONES) and not archivo.startswith('.'):
+                ruta = os.path.join(raiz, archivo)
+                relativa = os.path.relpath(ruta, entrada)
+                # Dataset particionado: el ensayo es el directorio de la partición
+                carpeta = os.path.dirname(relativa)
+                ensayo = carpeta if '=' in carpeta else os.path.splitext(relativa)[0]
+                ensayos.append((ensayo.replace(os.sep, '/'), ruta))
+    return ensayos
+
+
+def leer_ensayo(ruta, columnas=()):
+    """
+    Lee un ensayo (CSV con ',' o ';', Parquet o Feather) con los factores del
+    esquema y `columnas` con esos nombres aunque el ensayo use un alias
+    """
+    return como_factores(resolver_esquema(leer_tabla(ruta), columnas))
+
+
+def analizar_ensayo(df, ensayo, respuesta='Rendimiento_kg', cache=None):
+    """Pipeline DBCA de un ensayo como tabla ordenada (una fila por prueba/término)"""
+    filas = []
+
+    def agregar(analisis, termino='', comparacion='', estadistico=np.nan, gl=np.nan, p_valor=np.nan):
+        filas.append((ensayo, analisis, respuesta, termino, comparacion, estadistico, gl, p_valor))
+
+    # ANOVA factorial con bloques
+    modelo = anova_dbca(df, respuesta, FACTORES, cache=cache)
+    for termino, fila in modelo.tabla.iterrows():
+        agregar('anova', termino, estadistico=fila['F'], gl=fila['df'], p_valor=fila['PR(>F)'])
+    agregar('ajuste', 'R2', estadistico=modelo.rsquared, gl=modelo.gl_residual)
+
+    # Comparaciones múltiples de Tukey por factor con el CME del modelo factorial
+    for factor in FACTORES:
+        tukey = comparaciones_multiples(df, respuesta, factor, modelo, metodo='tukey', alpha=0.05)
+        for fila in tukey.pares.itertuples():
+            agregar('tukey', f'C({factor})', f'{fila.grupo1}-{fila.grupo2}',
+                    estadistico=fila.diferencia, gl=tukey.gl, p_valor=fila.p_valor)
+
+    # Supuestos: normalidad de residuos, homogeneidad de varianzas y aditividad (Tukey 1 gl)
+    diagnostico = diagnosticar_supuestos(df, [respuesta], FACTORES, modelos={respuesta: modelo})
+    for fila in diagnostico.pruebas.itertuples():
+        agregar(fila.prueba, fila.agrupacion, estadistico=fila.estadistico, gl=fila.gl1,
+                p_valor=fila.p_valor)
+    if diagnostico.pruebas.set_index('prueba').loc['shapiro', 'p_valor'] <= 0.05:
+        perm = anova_permutacion(df, respuesta, FACTORES, semilla=42, cache=cache)
+        for termino, fila in perm.drop(index=['C(Bloque)', 'Residual']).iterrows():
+            agregar('anova_permutacion', termino, estadistico=fila['F'], gl=fila['df'],
+                    p_valor=fila['PR(>F) perm'])
+
+    return pd.DataFrame(filas, columns=list(COLUMNAS_RESULTADO)).astype(COLUMNAS_RESULTADO)
+
+
+def _procesar(ensayo, ruta, respuesta):
+    """Tarea del pool: leer y analizar un ensayo; los errores se devuelven como filas"""
+    try:
+        return analizar_ensayo(leer_ensayo(ruta, [respuesta]), ensayo, respuesta, cache=_cache_proceso)
+    except Exception as error:
+        fila = {c: np.nan for c in COLUMNAS_RESULTADO}
+        fila.update(ensayo=ensayo, analisis='error', respuesta=respuesta,
+                    termino=type(error).__name__, comparacion=str(error))
+        return pd.DataFrame([fila]).astype(COLUMNAS_RESULTADO)
+
+
+def ejecutar_lote(entrada, salida, respuesta='Rendimiento_kg', procesos=None, en_vuelo=None):
+    """
+    Analiza todos los ensayos de `entrada` en un pool de `procesos` y escribe
+    cada resultado en `salida` al terminar. Como máximo `en_vuelo` ensayos
+    (por defecto 2 por proceso) se mantienen en memoria a la vez.
+    Devuelve el número de ensayos procesados.
+    """
+    ensayos = listar_ensayos(entrada)
+    procesos = procesos or os.cpu_count() or 1
+    en_vuelo = en_vuelo or 2 * procesos
+    escritor = EscritorTabla(salida)
+    pendientes = set()
+    completados = 0
+    try:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso) as pool:
+            for ensayo, ruta in ensayos:
+                if len(pendientes) >= en_vuelo:
+                    listos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        escritor.escribir(futuro.result())
+                        completados += 1
+                pendientes.add(pool.submit(_procesar, ensayo, ruta, respuesta))
+            for futuro in wait(pendientes).done:
+                escritor.escribir(futuro.result())
+                completados += 1
+    finally:
+        escritor.cerrar()
+    return completados
+
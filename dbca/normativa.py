@@ -0,0 +1,110 @@
+"""
+Verificación de Normativa para Cultivo de Quinua
+================================================
+Analiza el dataset de quinua (traducido 'quinua_simulada_es.csv' o, si no
+existe, el original 'quinua_simulada.csv': los nombres se resuelven al leerlo)
+para verificar si los parámetros agronómicos se encuentran dentro de los rangos aceptables según
+normativas técnicas referenciales (ej. NTP 205.062, FAO).
+
+Rangos de Referencia Utilizados:
+- pH del Suelo: 6.0 - 8.5 (Rango óptimo para quinua)
+- Altitud: 2500 - 4500 m.s.n.m. (Quinua de Altiplano)
+- Precipitación: > 100mm (Durante periodo vegetativo crítico, asumiendo datos parciales)
+- Calidad de Grano: >= 2.5 (En escala estimada de 1-5 para ser aceptable comercialmente)
+
+Sólo usa pandas: no importa scipy ni librerías de gráficos.
+"""
+
+from .datos import leer_datos
+
+DATOS = ('quinua_simulada_es.csv', 'quinua_simulada.csv')
+
+LIMS = {
+    'pH_Suelo': {'min': 6.0, 'max': 8.5, 'unidad': 'pH'},
+    'Altitud_m': {'min': 2500, 'max': 4500, 'unidad': 'msnm'},
+    'Dias_Cosecha': {'min': 100, 'max': 180, 'unidad': 'días'},
+}
+
+CALIDAD_MINIMA = 2.5
+
+# Columnas que usa el reporte, con estos nombres en cualquier variante del dataset
+COLUMNAS = ['ID_Parcela', *LIMS, 'Precipitacion_mm', 'Calidad_Grano', 'Rendimiento_kg']
+
+
+def verificar_rangos(df, limites=LIMS):
+    """Imprime el cumplimiento de cada variable y devuelve {variable: registros fuera de rango}"""
+    fuera = {}
+    for var, limites_var in limites.items():
+        min_val = limites_var['min']
+        max_val = limites_var['max']
+        unidad = limites_var['unidad']
+
+        # Identificar fuera de rango
+        fuera_rango = df[(df[var] < min_val) | (df[var] > max_val)]
+        num_fuera = len(fuera_rango)
+        pct_fuera = (num_fuera / len(df)) * 100
+        fuera[var] = num_fuera
+
+        status = "CUMPLE" if num_fuera == 0 else "ALERTA"
+
+        print(f"[{status}] Variable {var}:")
+        print(f"  - Rango normativo: {min_val} - {max_val} {unidad}")
+        print(f"  - Rango observado: {df[var].min()} - {df[var].max()} {unidad}")
+        if num_fuera > 0:
+            print(f"  - Registros fuera de norma: {num_fuera} ({pct_fuera:.1f}%)")
+            print(f"  - Indices (IDs): {fuera_rango['ID_Parcela'].head(5).tolist()} ...")
+        else:
+            print(f"  - Todos los registros cumplen la normativa.")
+        print("-" * 60)
+    return fuera
+
+
+def analizar_calidad(df, minima=CALIDAD_MINIMA):
+    """Calidad de grano (escala 1-5 asumida); devuelve el número de parcelas bajo `minima`"""
+    print(f"[ANÁLISIS] Calidad de Grano:")
+    print(f"  - Promedio del lote: {df['Calidad_Grano'].mean():.2f}")
+    baja = int((df['Calidad_Grano'] < minima).sum())
+    if baja > 0:
+        print(f"  - Alerta: {baja} parcelas con calidad baja (< {minima})")
+    else:
+        print(f"  - Excelente: Todas las parcelas tienen calidad aceptable (>= {minima})")
+    print("-" * 60)
+    return baja
+
+
+def analizar_rendimiento(df):
+    """Rendimiento promedio frente a los rangos normales de producción (1-5 t/ha)"""
+    print(f"[ANÁLISIS] Rendimiento (kg/parcela estimada o t/ha):")
+    rend_promedio = df['Rendimiento_kg'].mean()
+    print(f"  - Promedio: {rend_promedio:.2f}")
+    if rend_promedio < 1.0:
+        print("  - Nota: Rendimiento bajo promedio.")
+    elif rend_promedio > 5.0:
+        print("  - Nota: Rendimiento muy alto (posible error de datos o condición ideal).")
+    else:
+        print("  - Nota: Rendimiento dentro de rangos normales de producción (1-5 t/ha).")
+    return rend_promedio
+
+
+def ejecutar_normativa(rutas=DATOS):
+    """Reporte completo de cumplimiento. Devuelve el código de salida (1 si no hay datos)"""
+    rutas = [rutas] if isinstance(rutas, str) else list(rutas)
+    try:
+        df, ruta = leer_datos(*rutas, columnas=COLUMNAS)
+    except FileNotFoundError as error:
+        print(f"Error: {error}")
+        return 1
+
+    print("="*80)
+    print("REPORTE DE CUMPLIMIENTO DE NORMATIVA - CULTIVO DE QUINUA")
+    print("="*80)
+    print(f"\nAnalizando {len(df)} registros totales de {ruta}...\n")
+
+    verificar_rangos(df)
+    analizar_calidad(df)
+    analizar_rendimiento(df)
+
+    print("\n" + "="*80)
+    print("FIN DEL REPORTE")
+    print("="*80)
+    return 0
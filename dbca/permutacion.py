@@ -0,0 +1,94 @@
+"""
+ANOVA por permutaciones restringidas a bloques para el modelo DBCA
+Alternativa libre de distribución cuando los residuos no son normales:
+las observaciones se permutan sólo dentro de cada Bloque y se recalculan
+los F Tipo II de todos los términos.
+
+Las permutaciones se evalúan por lotes como productos matriciales: las
+sumas por celda de cada permutación se obtienen con un único bincount y
+se proyectan sobre las bases Q (ya factorizadas y cacheadas en DisenoDBCA)
+de cada submodelo, sin reajustar el modelo por permutación.
+"""
+
+import numpy as np
+
+from .anova import anova_dbca, construir_diseno, nombre_termino
+
+
+def permutaciones_en_bloques(bloques, n_permutaciones, rng):
+    """
+    Índices (N × n_permutaciones) que permutan las filas sólo dentro de su bloque.
+    Cada columna es una permutación independiente.
+    """
+    orden = np.argsort(bloques, kind='stable')
+    claves = bloques[orden][:, None] + rng.random((len(bloques), n_permutaciones))
+    return orden[np.argsort(claves, axis=0)]
+
+
+def anova_permutacion(df, respuesta, factores, bloque='Bloque', interacciones=True,
+                      n_permutaciones=9999, semilla=None, cache=None, tamano_lote=1000):
+    """
+    Tabla ANOVA Tipo II (mismas filas que anova_dbca) con la columna adicional
+    'PR(>F) perm': p-valor de permutación (1 + #{F* >= F}) / (B + 1), con las
+    observaciones permutadas dentro de cada bloque. El p-valor de permutación
+    del término de bloque queda en NaN a propósito: estas permutaciones no
+    mueven observaciones entre bloques, así que no generan la distribución
+    nula del efecto de bloque (su SC sólo es invariante en diseños
+    ortogonales; con celdas desbalanceadas la SC Tipo II ajustada cambia).
+    """
+    datos = df[df[respuesta].notna()]
+    modelo = anova_dbca(datos, respuesta, factores, bloque, interacciones, cache)
+    tabla = modelo.tabla.copy()
+
+    if cache is None:
+        diseno = construir_diseno(datos, factores, bloque, interacciones)
+    else:
+        clave, diseno = cache.obtener_diseno(datos, factores, bloque, interacciones)
+    validas = diseno.codigos >= 0
+    codigos = diseno.codigos[validas]
+    y = datos[respuesta].to_numpy(dtype=float)[validas]
+    bloques = datos[bloque].factorize()[0][validas] if bloque is not None else np.zeros(len(y), dtype=int)
+    c = len(diseno.indice)
+    n = np.bincount(codigos, minlength=c).astype(float)
+    raiz_n = np.sqrt(n)
+    ocupadas = n > 0
+
+    todos = diseno.todos_terminos
+    probados = [t for t in todos if t != (bloque,)]
+    submodelos = {}
+    for termino in probados:
+        base = [t for t in todos if not set(termino).issubset(t)]
+        submodelos[termino] = (diseno.factorizar(n, base), diseno.factorizar(n, base + [termino]))
+    Q_completo = diseno.factorizar(n, todos)
+    if cache is not None:
+        cache.guardar(clave, diseno)
+
+    gl = tabla['df']
+    gl_residual = gl['Residual']
+    suma_y2 = float(y @ y)
+    f_observado = tabla['F']
+    excedencias = dict.fromkeys(probados, 0)
+
+    rng = np.random.default_rng(semilla)
+    restantes = n_permutaciones
+    while restantes > 0:
+        lote = min(tamano_lote, restantes)
+        restantes -= lote
+        indices = permutaciones_en_bloques(bloques, lote, rng)
+        # Sumas por celda de cada permutación: las filas conservan su celda y reciben otro valor
+        plano = codigos[:, None] * lote + np.arange(lote)
+        sumas = np.bincount(plano.ravel(), weights=y[indices].ravel(), minlength=c * lote).reshape(c, lote)
+        Z = np.zeros_like(sumas)
+        Z[ocupadas] = sumas[ocupadas] / raiz_n[ocupadas, None]
+
+        sc_residual = suma_y2 - ((Q_completo.T @ Z) ** 2).sum(axis=0)
+        cme = sc_residual / gl_residual
+        for termino, (Q_base, Q_con) in submodelos.items():
+            sc = ((Q_con.T @ Z) ** 2).sum(axis=0) - ((Q_base.T @ Z) ** 2).sum(axis=0)
+            f = (sc / gl[nombre_termino(termino)]) / cme
+            excedencias[termino] += int((f >= f_observado[nombre_termino(termino)] * (1 - 1e-12)).sum())
+
+    tabla['PR(>F) perm'] = np.nan
+    for termino, conteo in excedencias.items():
+        tabla.loc[nombre_termino(termino), 'PR(>F) perm'] = (1 + conteo) / (n_permutaciones + 1)
+    return tabla
@@ -0,0 +1,170 @@
+"""
+Servicio HTTP local de paneles de boxplots
+Renderiza bajo demanda un solo panel del registro de dbca.boxplots (PANELES)
+en lugar de la hoja completa de 20 × 16 pulgadas, y guarda los PNG en un
+cache LRU en memoria acotado por tamaño. El IndiceGrupos de cada dataset
+también se conserva (LRU por archivo y fecha de modificación), de modo que
+pedir los doce paneles de un ensayo lee el CSV una sola vez.
+
+    python -m dbca servir --directorio ensayos/ --puerto 8050
+
+    GET /paneles                                  nombres y títulos (JSON)
+    GET /panel/<nombre>.png?datos=<csv>&dpi=100&resumen=1
+"""
+
+import io
+import json
+import os
+import threading
+import traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .boxplots import DATOS, PANELES, cargar_datos, figura_panel
+from .figuras import usar_agg
+from .grupos import IndiceGrupos
+
+
+class ServidorPaneles:
+    """
+    Paneles PNG de los CSV de `directorio` con cache LRU en memoria: a lo
+    sumo `max_bytes` de PNG y `max_datasets` índices de datasets.
+    """
+
+    def __init__(self, directorio='.', max_bytes=64 * 2 ** 20, max_datasets=8):
+        self.directorio = os.path.realpath(directorio)
+        self.max_bytes = max_bytes
+        self.max_datasets = max_datasets
+        self.aciertos = 0
+        self.fallos = 0
+        self._pngs = OrderedDict()
+        self._bytes = 0
+        self._indices = OrderedDict()
+        # pyplot no es seguro entre hilos: un panel se dibuja a la vez
+        self._candado = threading.Lock()
+
+    def ruta(self, datos=None):
+        """Ruta del CSV pedido (dentro de `directorio`) o del dataset por defecto"""
+        candidatos = [datos] if datos else list(DATOS)
+        for nombre in candidatos:
+            ruta = os.path.realpath(os.path.join(self.directorio, nombre))
+            if os.path.commonpath([ruta, self.directorio]) != self.directorio:
+                raise PermissionError(f"{nombre} está fuera de {self.directorio}")
+            if os.path.isfile(ruta):
+                return ruta
+        raise FileNotFoundError(f"No se encontró {' ni '.join(candidatos)}")
+
+    def _indice(self, ruta, version):
+        clave = (ruta, version)
+        if clave not in self._indices:
+            self._indices[clave] = IndiceGrupos(cargar_datos((ruta,)))
+            while len(self._indices) > self.max_datasets:
+                self._indices.popitem(last=False)
+        self._indices.move_to_end(clave)
+        return self._indices[clave]
+
+    def png(self, nombre, datos=None, dpi=100, resumen=False):
+        """(PNG del panel, True si salió del cache); KeyError si el panel no existe"""
+        import matplotlib.pyplot as plt
+
+        if nombre not in PANELES:
+            raise KeyError(nombre)
+        ruta = self.ruta(datos)
+        estado = os.stat(ruta)
+        version = (estado.st_mtime_ns, estado.st_size)
+        clave = (ruta, version, nombre, dpi, resumen)
+        with self._candado:
+            if clave in self._pngs:
+                self._pngs.move_to_end(clave)
+                self.aciertos += 1
+                return self._pngs[clave], True
+            self.fallos += 1
+            fig = figura_panel(self._indice(ruta, version), nombre, resumen)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+            plt.close(fig)
+            contenido = buffer.getvalue()
+            self._pngs[clave] = contenido
+            self._bytes += len(contenido)
+            while self._bytes > self.max_bytes and len(self._pngs) > 1:
+                self._bytes -= len(self._pngs.popitem(last=False)[1])
+            return contenido, False
+
+
+def crear_manejador(servidor):
+    """Clase de BaseHTTPRequestHandler que atiende los pedidos con `servidor`"""
+
+    class Manejador(BaseHTTPRequestHandler):
+        def _responder(self, codigo, contenido, tipo, cache=None):
+            self.send_response(codigo)
+            self.send_header('Content-Type', tipo)
+            self.send_header('Content-Length', str(len(contenido)))
+            if cache is not None:
+                self.send_header('X-Cache', 'HIT' if cache else 'MISS')
+            self.end_headers()
+            self.wfile.write(contenido)
+
+        def _error(self, codigo, mensaje):
+            self._responder(codigo, json.dumps({'error': mensaje}).encode('utf-8'),
+                            'application/json; charset=utf-8')
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parametros = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if url.path == '/paneles':
+                contenido = {nombre: panel.titulo for nombre, panel in PANELES.items()}
+                self._responder(200, json.dumps(contenido, ensure_ascii=False).encode('utf-8'),
+                                'application/json; charset=utf-8')
+                return
+            if not (url.path.startswith('/panel/') and url.path.endswith('.png')):
+                self._error(404, f"Ruta desconocida: {url.path}")
+                return
+            nombre = url.path[len('/panel/'):-len('.png')]
+            if nombre not in PANELES:
+                self._error(404, f"Panel desconocido: {nombre}")
+                return
+            try:
+                dpi = int(parametros.get('dpi', 100))
+                if not 10 <= dpi <= 600:
+                    raise ValueError
+            except ValueError:
+                self._error(400, "dpi debe ser un entero entre 10 y 600")
+                return
+            resumen = parametros.get('resumen', '0').lower() in ('1', 'true', 'si', 'sí')
+            try:
+                contenido, acierto = servidor.png(nombre, parametros.get('datos'), dpi, resumen)
+            except PermissionError as e:
+                self._error(403, str(e))
+            except FileNotFoundError as e:
+                self._error(404, str(e))
+            except KeyError as e:
+                self._error(400, f"El dataset no tiene la columna {e}")
+            except (ValueError, OSError) as e:
+                # Un archivo del directorio que no es un dataset: README o CSV mal formado (ParserError),
+                # vacío (EmptyDataError), binario (UnicodeDecodeError), Parquet dañado (ArrowInvalid) o
+                # una respuesta no numérica
+                self._error(400, f"No se pudo leer {parametros.get('datos')}: {e}")
+            except Exception as e:
+                # Ningún pedido queda sin respuesta: el error se registra y el cliente recibe un 500
+                self.log_error('%s', traceback.format_exc())
+                self._error(500, f"Error interno: {e}")
+            else:
+                self._responder(200, contenido, 'image/png', cache=acierto)
+
+    return Manejador
+
+
+def servir(directorio='.', host='127.0.0.1', puerto=8050, max_bytes=64 * 2 ** 20):
+    """Atiende pedidos de paneles hasta Ctrl+C"""
+    usar_agg()
+    servidor = ServidorPaneles(directorio, max_bytes)
+    http = ThreadingHTTPServer((host, puerto), crear_manejador(servidor))
+    print(f"Sirviendo paneles de {servidor.directorio} en http://{host}:{http.server_address[1]}/paneles")
+    try:
+        http.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http.server_close()
+    print(f"✓ Paneles servidos: {servidor.aciertos} desde cache, {servidor.fallos} renderizados")
@@ -0,0 +1,301 @@
+"""
+Generación de ensayos DBCA simulados de quinua
+El diseño se define en un archivo de especificación JSON (factores y niveles,
+efectos principales e interacciones, ambiente y réplicas de cada bloque,
+covariables y orden de columnas); el de referencia es
+dbca/disenos/quinua_5replicas.json: 2 Variedades × 3 Fertilizantes × 2 Riegos
+= 12 Tratamientos en 3 bloques con 2 + 2 + 1 réplicas, 60 unidades
+experimentales.
+
+El índice tratamiento × bloque × réplica se arma con aritmética sobre la
+posición de cada fila, los efectos e interacciones se aplican como una tabla
+(un eje por factor) indexada por los códigos de los factores y todo el ruido
+y las covariables se sortean en bloque de un np.random.Generator. Las filas
+se producen por partes de `tamano_bloque` y se escriben a CSV o Parquet a
+medida que se generan, con memoria constante: así se generan ensayos de
+10^6-10^8 parcelas (más grandes que la RAM) para pruebas de carga.
+
+Cada tramo de FILAS_POR_FLUJO filas tiene su propio flujo aleatorio, hijo de
+SeedSequence(semilla).spawn: las partes (múltiplos de ese tramo) se generan
+en paralelo en un pool de procesos y el resultado es idéntico byte a byte
+para cualquier número de procesos o tamaño de parte.
+"""
+
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .datos import EscritorTabla
+
+DISENO_QUINUA = os.path.join(os.path.dirname(__file__), 'disenos', 'quinua_5replicas.json')
+
+# Filas de cada flujo aleatorio independiente; las partes son múltiplos de este tamaño
+FILAS_POR_FLUJO = 2 ** 16
+TAMANO_BLOQUE = 16 * FILAS_POR_FLUJO
+
+
+@dataclass
+class Diseno:
+    """Especificación de un ensayo DBCA simulado (ver dbca/disenos/quinua_5replicas.json)"""
+    factores: dict
+    bloques: dict
+    respuesta: dict
+    covariables: dict = field(default_factory=dict)
+    identificador: dict = field(default_factory=lambda: {'columna': 'PlotID', 'prefijo': 'P', 'digitos': 3})
+    tratamiento: str = 'Tratamiento'
+    columnas: list = None
+    descripcion: str = ''
+
+    def __post_init__(self):
+        efectos = self.respuesta.get('efectos', {})
+        niveles_usados = [{f: n} for f, por_nivel in efectos.items() for n in por_nivel]
+        niveles_usados += [i['niveles'] for i in self.respuesta.get('interacciones', [])]
+        for niveles in niveles_usados:
+            for factor, nivel in niveles.items():
+                if nivel not in self.factores.get(factor, []):
+                    raise ValueError(f"Efecto sobre un nivel inexistente: {factor}={nivel}")
+        for bloque, ambiente in self.bloques.items():
+            if int(ambiente.get('replicas', 0)) < 1:
+                raise ValueError(f"{bloque}: 'replicas' debe ser un entero positivo")
+            for col, spec in self.covariables.items():
+                if spec.get('media') == 'bloque' and col not in ambiente:
+                    raise ValueError(f"{bloque}: falta la media de la covariable {col}")
+
+    @property
+    def forma(self):
+        """Niveles de cada factor, en orden de los ejes de la tabla de efectos"""
+        return tuple(len(niveles) for niveles in self.factores.values())
+
+    def tratamientos(self):
+        """Nombres de los tratamientos (niveles unidos por '_') en orden de código"""
+        combinaciones = pd.MultiIndex.from_product(list(self.factores.values()))
+        return ['_'.join(map(str, c)) for c in combinaciones]
+
+    def medias_tratamiento(self):
+        """Respuesta media de cada tratamiento: base + efectos principales + interacciones"""
+        tabla = np.full(self.forma, float(self.respuesta.get('base', 0.0)))
+        ejes = list(self.factores)
+        efectos = [({f: n}, e) for f, por_nivel in self.respuesta.get('efectos', {}).items()
+                   for n, e in por_nivel.items()]
+        efectos += [(i['niveles'], i['efecto']) for i in self.respuesta.get('interacciones', [])]
+        for niveles, efecto in efectos:
+            # El efecto se suma en la sub-tabla de las celdas con esos niveles
+            indice = tuple(self.factores[f].index(niveles[f]) if f in niveles else slice(None)
+                           for f in ejes)
+            tabla[indice] += efecto
+        return tabla.ravel()
+
+    def replicas(self, replicas=None):
+        """Réplicas de cada tratamiento por bloque (del diseño, o un número o uno por bloque)"""
+        if replicas is None:
+            replicas = [ambiente['replicas'] for ambiente in self.bloques.values()]
+        elif np.ndim(replicas) == 0:
+            replicas = [replicas] * len(self.bloques)
+        replicas = np.asarray(replicas, dtype=np.int64)
+        if len(replicas) != len(self.bloques) or (replicas < 1).any():
+            raise ValueError(f"Se esperaban {len(self.bloques)} números de réplicas positivos, "
+                             f"no {list(replicas)}")
+        return replicas
+
+    def n_parcelas(self, replicas=None):
+        return int(np.prod(self.forma) * self.replicas(replicas).sum())
+
+
+def leer_diseno(ruta=DISENO_QUINUA):
+    """Diseno desde un archivo JSON de especificación"""
+    with open(ruta, encoding='utf-8') as f:
+        return Diseno(**json.load(f))
+
+
+def _identificadores(prefijo, digitos, inicio, n):
+    """Identificadores prefijo + número con al menos `digitos` dígitos: P001, P002, ..."""
+    numeros = np.arange(inicio, inicio + n).astype(str)
+    return np.char.add(prefijo, np.char.zfill(numeros, digitos))
+
+
+def _redondear(x, spec):
+    if 'min' in spec or 'max' in spec:
+        x = np.clip(x, spec.get('min', -np.inf), spec.get('max', np.inf))
+    if spec.get('entero'):
+        return x.astype(np.int32)
+    if 'decimales' in spec:
+        return x.round(spec['decimales'])
+    return x
+
+
+def _covariable(spec, columna, ambientes, bloque, rng):
+    n = len(bloque)
+    if 'valores' in spec:
+        return rng.choice(np.asarray(spec['valores']), n, p=spec.get('probabilidades'))
+    if spec.get('media') == 'bloque':
+        media = np.array([ambiente[columna] for ambiente in ambientes], dtype=float)[bloque]
+    else:
+        media = float(spec.get('media', 0.0))
+    return _redondear(media + rng.normal(0, spec.get('desviacion', 0.0), n), spec)
+
+
+def _filas(diseno, replicas, desde, hasta, flujos):
+    """
+    DataFrame de las parcelas desde, ..., hasta - 1 (orden bloque → tratamiento
+    → réplica). `desde` es múltiplo de FILAS_POR_FLUJO y `flujos` son las
+    SeedSequence de los tramos de FILAS_POR_FLUJO filas que cubre el rango.
+    """
+    filas_bloque = int(np.prod(diseno.forma)) * replicas
+    fin = np.cumsum(filas_bloque)
+    posicion = np.arange(desde, hasta, dtype=np.int64)
+    bloque = np.searchsorted(fin, posicion, side='right').astype(np.int32)
+    posicion -= (fin - filas_bloque)[bloque]
+    por_bloque = replicas[bloque]
+    tratamiento = (posicion // por_bloque).astype(np.int32)
+    replicacion = (posicion % por_bloque + 1).astype(np.int32)
+    del posicion, por_bloque
+    codigos = np.unravel_index(tratamiento, diseno.forma)
+
+    ambientes = list(diseno.bloques.values())
+    respuesta = diseno.respuesta
+    medias = diseno.medias_tratamiento()
+    efecto_bloque = np.array([a.get('efecto', 0.0) for a in ambientes])
+    # Cada tramo sortea sus columnas con su propio generador: los valores de
+    # una fila no dependen de cómo se reparte el ensayo en partes ni procesos
+    sorteos = {}
+    for k, flujo in enumerate(flujos):
+        tramo = slice(k * FILAS_POR_FLUJO, (k + 1) * FILAS_POR_FLUJO)
+        b = bloque[tramo]
+        rng = np.random.default_rng(flujo)
+        y = (medias[tratamiento[tramo]] + efecto_bloque[b]
+             + rng.normal(0, respuesta.get('desviacion', 0.0), len(b)))
+        sorteos.setdefault(respuesta['columna'], []).append(_redondear(y, respuesta))
+        for col, spec in diseno.covariables.items():
+            sorteos.setdefault(col, []).append(_covariable(spec, col, ambientes, b, rng))
+
+    id_columna = diseno.identificador['columna']
+    columnas = {
+        id_columna: _identificadores(diseno.identificador.get('prefijo', ''),
+                                     diseno.identificador.get('digitos', 1), desde + 1, len(bloque)),
+        'Bloque': pd.Categorical.from_codes(bloque, list(diseno.bloques)),
+        'Replicacion': replicacion,
+    }
+    for (factor, niveles), cod in zip(diseno.factores.items(), codigos):
+        columnas[factor] = pd.Categorical.from_codes(cod.astype(np.int32), niveles)
+    for col, partes in sorteos.items():
+        columnas[col] = np.concatenate(partes)
+    columnas[diseno.tratamiento] = pd.Categorical.from_codes(tratamiento, diseno.tratamientos())
+
+    df = pd.DataFrame(columnas)
+    return df[diseno.columnas] if diseno.columnas else df
+
+
+def _particion(diseno, replicas, semilla, tamano_bloque):
+    """
+    Partes (desde, hasta, flujos) del ensayo. Hay un flujo por tramo de
+    FILAS_POR_FLUJO filas (SeedSequence(semilla).spawn); `tamano_bloque` se
+    redondea a un múltiplo de FILAS_POR_FLUJO.
+    """
+    n = diseno.n_parcelas(replicas)
+    flujos = np.random.SeedSequence(semilla).spawn(-(-n // FILAS_POR_FLUJO))
+    tramos = max(1, -(-tamano_bloque // FILAS_POR_FLUJO))
+    return [(desde, min(desde + tramos * FILAS_POR_FLUJO, n),
+             flujos[desde // FILAS_POR_FLUJO:desde // FILAS_POR_FLUJO + tramos])
+            for desde in range(0, n, tramos * FILAS_POR_FLUJO)]
+
+
+def bloques_ensayo(diseno=None, replicas=None, semilla=42, tamano_bloque=TAMANO_BLOQUE):
+    """Genera el ensayo por partes de alrededor de `tamano_bloque` filas (DataFrames)"""
+    diseno = diseno or leer_diseno()
+    replicas = diseno.replicas(replicas)
+    for desde, hasta, flujos in _particion(diseno, replicas, semilla, tamano_bloque):
+        yield _filas(diseno, replicas, desde, hasta, flujos)
+
+
+def generar_ensayo(diseno=None, replicas=None, semilla=42):
+    """
+    DataFrame completo de un ensayo simulado: por cada bloque, cada
+    tratamiento con sus réplicas (las del diseño, o `replicas`: un número por
+    bloque, o uno solo para todos). Los factores son categóricos; el
+    resultado es el mismo que concatenar bloques_ensayo().
+    """
+    diseno = diseno or leer_diseno()
+    return pd.concat(bloques_ensayo(diseno, replicas, semilla, diseno.n_parcelas(replicas)),
+                     ignore_index=True)
+
+
+def _parte(diseno, replicas, desde, hasta, flujos, respuesta, parquet):
+    """Una parte lista para escribir (DataFrame o texto CSV) y su resumen"""
+    df = _filas(diseno, replicas, desde, hasta, flujos)
+    y = df[respuesta].to_numpy(dtype=float)
+    resumen = {
+        'bloques': df['Bloque'].value_counts(sort=False),
+        'tratamientos': df[diseno.tratamiento].value_counts(sort=False),
+        'n': len(y), 'media': y.mean(), 'm2': ((y - y.mean()) ** 2).sum(),
+        'min': y.min(), 'max': y.max(), 'primeras': df.head(10) if desde == 0 else None,
+    }
+    return (df if parquet else df.to_csv(index=False, header=desde == 0)), resumen
+
+
+def ejecutar_generacion(salida='quinua_5replicas.csv', diseno=None, replicas=None,
+                        semilla=42, tamano_bloque=TAMANO_BLOQUE, procesos=None):
+    """
+    Genera el ensayo de la especificación `diseno` en un pool de `procesos`
+    y lo escribe en `salida` (CSV o Parquet) por partes y en orden,
+    imprimiendo su distribución. Con la misma semilla el CSV es idéntico byte
+    a byte para cualquier `procesos` y `tamano_bloque`. Devuelve el número de
+    parcelas.
+    """
+    diseno = leer_diseno(diseno or DISENO_QUINUA)
+    replicas = diseno.replicas(replicas)
+    respuesta = diseno.respuesta['columna']
+    partes = _particion(diseno, replicas, semilla, tamano_bloque)
+    procesos = min(procesos or os.cpu_count() or 1, len(partes))
+    escritor = EscritorTabla(salida)
+    resumenes = []
+
+    def guardar(resultado):
+        tabla, resumen = resultado
+        escritor.escribir(tabla)
+        resumenes.append(resumen)
+
+    try:
+        if procesos <= 1:
+            for desde, hasta, flujos in partes:
+                guardar(_parte(diseno, replicas, desde, hasta, flujos, respuesta, escritor.parquet))
+        else:
+            # Partes en vuelo acotadas (2 por proceso); se escriben en orden
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                en_vuelo = deque()
+                for desde, hasta, flujos in partes:
+                    if len(en_vuelo) >= 2 * procesos:
+                        guardar(en_vuelo.popleft().result())
+                    en_vuelo.append(pool.submit(_parte, diseno, replicas, desde, hasta, flujos,
+                                                respuesta, escritor.parquet))
+                while en_vuelo:
+                    guardar(en_vuelo.popleft().result())
+    finally:
+        escritor.cerrar()
+
+    # Media y varianza combinadas de las partes (fórmula de Chan et al.)
+    n = media = m2 = 0.0
+    for r in resumenes:
+        delta = r['media'] - media
+        total = n + r['n']
+        media += delta * r['n'] / total
+        m2 += r['m2'] + delta ** 2 * n * r['n'] / total
+        n = total
+
+    print(f"Total de observaciones generadas: {int(n)}")
+    print(f"\nDistribución por bloque:")
+    print(sum(r['bloques'] for r in resumenes))
+    print(f"\nDistribución por tratamiento:")
+    print(sum(r['tratamientos'] for r in resumenes))
+    print(f"\n✓ Datos guardados en: {salida}")
+    print(f"\nPrimeras filas:")
+    print(resumenes[0]['primeras'])
+    print(f"\nEstadísticas de {respuesta}:")
+    print(pd.Series({'count': n, 'mean': media, 'std': np.sqrt(m2 / (n - 1)) if n > 1 else np.nan,
+                     'min': min(r['min'] for r in resumenes),
+                     'max': max(r['max'] for r in resumenes)}, name=respuesta))
+    return int(n)
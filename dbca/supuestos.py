@@ -0,0 +1,191 @@
+"""
+Verificación de supuestos del ANOVA DBCA para muchas variables y agrupaciones
+- Homogeneidad de varianzas: Levene (centro media), Brown-Forsythe (centro
+  mediana, el 'levene' por defecto de scipy) y Bartlett.
+- Normalidad: Shapiro-Wilk sobre los residuos del modelo DBCA.
+- Aditividad: prueba de no aditividad de Tukey (1 gl) y, si hay réplicas
+  dentro de las celdas, interacción Bloque × Tratamiento contra el error puro;
+  ambas desde medias de celda y marginales, sin ajustar el modelo saturado.
+- Resumen de residuos: media, desviación, asimetría, curtosis, mínimo y máximo.
+
+Cada agrupación (por defecto la combinación de factores = Tratamiento) se
+codifica una sola vez y todas las variables respuesta se procesan juntas con
+transformaciones agrupadas (media/mediana por grupo), sin filtrar el
+DataFrame una vez por tratamiento.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.linalg import qr
+
+from .anova import anova_dbca_multiple
+
+
+@dataclass
+class ResultadoSupuestos:
+    """Tabla de pruebas (una fila por respuesta × prueba × agrupación) y resumen de residuos"""
+    pruebas: pd.DataFrame
+    residuos: pd.DataFrame
+
+
+def codificar_grupos(df, columnas):
+    """Código entero de grupo por fila (-1 si falta algún factor)"""
+    return df.groupby(list(columnas), observed=True, sort=True).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+
+
+def _anova_una_via(Z, codigos):
+    """F de un ANOVA de una vía para cada columna de Z (los NaN no cuentan)"""
+    grupos = Z.groupby(codigos)
+    n = grupos.count()
+    N, k = n.sum(), (n > 0).sum()
+    sc_entre = (n * (grupos.mean() - Z.mean()) ** 2).sum()
+    sc_dentro = ((Z - grupos.transform('mean')) ** 2).sum()
+    f = (N - k) / (k - 1) * sc_entre / sc_dentro
+    return f, k - 1, N - k, pd.Series(stats.f.sf(f, k - 1, N - k), index=Z.columns)
+
+
+def homogeneidad_varianzas(Y, codigos):
+    """Levene, Brown-Forsythe y Bartlett para todas las columnas de Y con una sola codificación"""
+    validas = codigos >= 0
+    Y, codigos = Y[validas], codigos[validas]
+    grupos = Y.groupby(codigos)
+    filas = []
+    for prueba, centro in (('levene', 'mean'), ('brown_forsythe', 'median')):
+        Z = (Y - grupos.transform(centro)).abs()
+        f, gl1, gl2, p = _anova_una_via(Z, codigos)
+        filas += [(r, prueba, f[r], gl1[r], gl2[r], p[r]) for r in Y.columns]
+
+    # Bartlett con los grupos de al menos 2 observaciones
+    n, var = grupos.count(), grupos.var()
+    usables = n >= 2
+    gi = (n - 1).where(usables, 0)
+    N, k = n.where(usables, 0).sum(), usables.sum()
+    var_comb = (gi * var.where(usables, 0)).sum() / (N - k)
+    numerador = (N - k) * np.log(var_comb) - (gi * np.log(var.where(usables))).sum()
+    correccion = 1 + ((1 / gi.where(usables)).sum() - 1 / (N - k)) / (3 * (k - 1))
+    t = numerador / correccion
+    p = pd.Series(stats.chi2.sf(t, k - 1), index=Y.columns)
+    filas += [(r, 'bartlett', t[r], k[r] - 1, np.nan, p[r]) for r in Y.columns]
+    return pd.DataFrame(filas, columns=['respuesta', 'prueba', 'estadistico', 'gl1', 'gl2', 'p_valor'])
+
+
+def prueba_aditividad(df, respuesta, factores, bloque='Bloque'):
+    """
+    No aditividad de Tukey (1 gl) e interacción Bloque × Tratamiento con réplicas.
+
+    El Tratamiento es la combinación de `factores`. Con frecuencias
+    proporcionales el modelo aditivo sale de las medias marginales de bloque y
+    tratamiento (O(n)); si no, de mínimos cuadrados ponderados sobre las celdas
+    con sólo b + t - 1 columnas. La prueba de Tukey añade el cuadrado de los
+    valores ajustados al modelo aditivo; la de interacción compara el modelo
+    aditivo con las medias de celda usando la variación dentro de celdas.
+    Devuelve una tabla con filas 'no_aditividad' e 'interaccion'.
+    """
+    celdas = df.groupby([bloque] + list(factores), observed=True, sort=True)[respuesta].agg(
+        ['count', 'mean', 'var'])
+    celdas = celdas[celdas['count'] > 0]
+    n = celdas['count'].to_numpy(dtype=float)
+    m = celdas['mean'].to_numpy(dtype=float)
+    sc_intra = float((celdas['var'].fillna(0.0) * (celdas['count'] - 1)).sum())
+    cb = pd.factorize(celdas.index.get_level_values(bloque))[0]
+    ct = pd.factorize(celdas.index.droplevel(bloque))[0]
+    B, T, c, N = cb.max() + 1, ct.max() + 1, len(n), n.sum()
+
+    n_b, n_t = np.bincount(cb, n, B), np.bincount(ct, n, T)
+    tabla_n = np.zeros((B, T))
+    tabla_n[cb, ct] = n
+    if np.allclose(tabla_n, np.outer(n_b, n_t) / N):
+        # Frecuencias proporcionales: efectos de bloque y tratamiento ortogonales
+        media = (n * m).sum() / N
+        alfa = np.bincount(cb, n * m, B) / n_b - media
+        beta = np.bincount(ct, n * m, T) / n_t - media
+        ajuste = media + alfa[cb] + beta[ct]
+        rango = B + T - 1
+        z = alfa[cb] * beta[ct]
+        sc_no_aditiva = (n * m * z).sum() ** 2 / (n * z ** 2).sum()
+    else:
+        raiz_n = np.sqrt(n)
+        X = np.hstack([np.ones((c, 1)),
+                       (cb[:, None] == np.arange(1, B)).astype(float),
+                       (ct[:, None] == np.arange(1, T)).astype(float)]) * raiz_n[:, None]
+        Q, R, _ = qr(X, mode='economic', pivoting=True)
+        diag = np.abs(np.diag(R))
+        rango = int((diag > diag.max() * max(X.shape) * np.finfo(float).eps).sum())
+        Q = Q[:, :rango]
+        ajuste = Q @ (Q.T @ (raiz_n * m)) / raiz_n
+        zw = raiz_n * ajuste ** 2
+        zw -= Q @ (Q.T @ zw)
+        sc_no_aditiva = (raiz_n * (m - ajuste) @ zw) ** 2 / (zw @ zw)
+
+    sc_aditivo = sc_intra + (n * (m - ajuste) ** 2).sum()
+    gl_aditivo = N - rango
+    filas = {}
+    gl_error = gl_aditivo - 1
+    f = sc_no_aditiva / ((sc_aditivo - sc_no_aditiva) / gl_error)
+    filas['no_aditividad'] = [sc_no_aditiva, 1.0, f, stats.f.sf(f, 1, gl_error), gl_error]
+
+    gl_puro, gl_interaccion = N - c, c - rango
+    if gl_puro > 0 and gl_interaccion > 0:
+        f = ((sc_aditivo - sc_intra) / gl_interaccion) / (sc_intra / gl_puro)
+        filas['interaccion'] = [sc_aditivo - sc_intra, gl_interaccion, f,
+                                stats.f.sf(f, gl_interaccion, gl_puro), gl_puro]
+    else:
+        filas['interaccion'] = [np.nan, gl_interaccion, np.nan, np.nan, gl_puro]
+    return pd.DataFrame.from_dict(filas, orient='index',
+                                  columns=['sum_sq', 'df', 'F', 'PR(>F)', 'df_error'])
+
+
+def resumen_residuos(residuos):
+    """Shapiro-Wilk y estadísticos descriptivos de los residuos de cada respuesta"""
+    filas, pruebas = {}, []
+    for respuesta, r in residuos.items():
+        r = r.dropna().to_numpy()
+        w, p = stats.shapiro(r) if len(r) >= 3 else (np.nan, np.nan)
+        pruebas.append((respuesta, 'shapiro', 'Residual', w, np.nan, np.nan, p))
+        filas[respuesta] = {
+            'n': len(r), 'media': r.mean(), 'desv': r.std(ddof=1),
+            'asimetria': stats.skew(r), 'curtosis': stats.kurtosis(r),
+            'min': r.min(), 'max': r.max(),
+        }
+    tabla = pd.DataFrame(pruebas, columns=['respuesta', 'prueba', 'agrupacion', 'estadistico',
+                                           'gl1', 'gl2', 'p_valor'])
+    return tabla, pd.DataFrame.from_dict(filas, orient='index')
+
+
+def diagnosticar_supuestos(df, respuestas, factores, bloque='Bloque', agrupaciones=None,
+                           modelos=None, cache=None):
+    """
+    Supuestos del modelo DBCA factorial para todas las `respuestas`.
+
+    `agrupaciones` es una lista de listas de columnas para las pruebas de
+    homogeneidad (por defecto sólo la combinación de `factores`). Los residuos
+    se toman de `modelos` (salida de anova_dbca_multiple) o se calculan con
+    una única factorización para todas las respuestas.
+    """
+    respuestas = list(respuestas)
+    agrupaciones = agrupaciones or [list(factores)]
+    if modelos is None:
+        modelos = anova_dbca_multiple(df, respuestas, factores, bloque, cache=cache)
+
+    Y = df[respuestas].astype(float)
+    tablas = []
+    for columnas in agrupaciones:
+        tabla = homogeneidad_varianzas(Y, codificar_grupos(df, columnas))
+        tabla.insert(2, 'agrupacion', '×'.join(columnas))
+        tablas.append(tabla)
+
+    tratamiento = '×'.join(factores)
+    aditividad = []
+    for r in respuestas:
+        tabla = prueba_aditividad(df, r, factores, bloque) if bloque is not None else pd.DataFrame()
+        aditividad += [(r, prueba, f'{bloque}×{tratamiento}', fila['F'], fila['df'], fila['df_error'],
+                        fila['PR(>F)']) for prueba, fila in tabla.iterrows()]
+    aditividad = pd.DataFrame(aditividad, columns=tablas[0].columns)
+
+    residuos = pd.DataFrame({r: modelos[r].residuos for r in respuestas})
+    normalidad, resumen = resumen_residuos(residuos)
+    pruebas = pd.concat([normalidad] + tablas + [aditividad], ignore_index=True)
+    return ResultadoSupuestos(pruebas=pruebas, residuos=resumen)
@@ -0,0 +1,99 @@
+"""
+Traducción en streaming de exportaciones de campo
+Lee un CSV (',' o ';') por bloques de `tamano_bloque` filas, renombra las
+columnas y traduce los niveles de los factores y escribe cada bloque
+directamente a un único CSV o Parquet (dbca.datos.EscritorTabla): la memoria
+no depende del tamaño del archivo, así que sirve para exportaciones de
+sensores de varios GB.
+
+Los factores se leen como categorías y se traducen renombrando sus niveles
+(una consulta al diccionario por nivel, no por fila); en un CSV de salida el
+resto de las columnas pasa como texto, sin parsear ni reformatear números.
+
+Las tablas de traducción viven en un archivo JSON con un bloque por idioma
+('columnas': nombre original → traducido, 'niveles': factor → nivel original
+→ traducido); el de referencia es dbca/traducciones/quinua.json (es, pt, en).
+"""
+
+import json
+import time
+
+import pandas as pd
+
+from .datos import TRADUCCION_QUINUA, VALORES_FALTANTES, EscritorTabla, renombrar_niveles, separador_csv
+
+
+def leer_traduccion(ruta=TRADUCCION_QUINUA, idioma='es'):
+    """Tablas {'columnas': ..., 'niveles': ...} de `idioma` desde un archivo JSON de traducciones"""
+    with open(ruta, encoding='utf-8') as f:
+        idiomas = json.load(f)['idiomas']
+    if idioma not in idiomas:
+        raise ValueError(f"Idioma '{idioma}' no definido en {ruta} (disponibles: {', '.join(idiomas)})")
+    return {'columnas': idiomas[idioma].get('columnas', {}), 'niveles': idiomas[idioma].get('niveles', {})}
+
+
+def traducir_bloque(bloque, traduccion):
+    """Traduce los niveles de los factores y luego los nombres de columna de un bloque"""
+    for col, mapa in traduccion['niveles'].items():
+        if col in bloque:
+            bloque[col] = renombrar_niveles(bloque[col], mapa)
+    return bloque.rename(columns=traduccion['columnas'])
+
+
+def bloques_traducidos(entrada, traduccion, tamano_bloque=500_000, texto=False):
+    """
+    Genera los bloques traducidos de `entrada`. Con `texto`, las columnas que
+    no son factores pasan como texto tal cual (para escribir CSV); si no, se
+    parsean con los tipos inferidos del primer bloque (enteros con faltantes
+    admitidos) para que todas las partes de un Parquet tengan el mismo esquema.
+    """
+    sep = separador_csv(entrada)
+    opciones = {'sep': sep, 'keep_default_na': False}
+    columnas = pd.read_csv(entrada, nrows=0, **opciones).columns
+    factores = [col for col in traduccion['niveles'] if col in columnas]
+    # Como texto, el resto de las columnas se copia literalmente (ningún valor se vuelve faltante)
+    opciones['na_values'] = {col: [''] if col in factores else [] if texto else VALORES_FALTANTES
+                             for col in columnas}
+    tipos = {col: 'category' for col in factores}
+    if texto:
+        tipos.update({col: str for col in columnas if col not in factores})
+    else:
+        muestra = pd.read_csv(entrada, nrows=tamano_bloque, dtype=tipos, **opciones)
+        tipos.update({col: 'Int64' if pd.api.types.is_integer_dtype(tipo) else tipo
+                      for col, tipo in muestra.dtypes.items() if col not in factores})
+        del muestra
+    with pd.read_csv(entrada, chunksize=tamano_bloque, dtype=tipos, **opciones) as lector:
+        for bloque in lector:
+            yield traducir_bloque(bloque, traduccion)
+
+
+def traducir_datos(entrada, salida, idioma='es', traduccion=TRADUCCION_QUINUA, tamano_bloque=500_000):
+    """
+    Traduce `entrada` a `salida` (.csv o .parquet) por bloques con las tablas
+    de `idioma` del archivo `traduccion`. Devuelve (filas, primer bloque traducido).
+    """
+    tablas = leer_traduccion(traduccion, idioma)
+    escritor = EscritorTabla(salida)
+    filas, primero = 0, None
+    try:
+        for bloque in bloques_traducidos(entrada, tablas, tamano_bloque, texto=not escritor.parquet):
+            escritor.escribir(bloque)
+            filas += len(bloque)
+            if primero is None:
+                primero = bloque.head()
+    finally:
+        escritor.cerrar()
+    return filas, primero
+
+
+def ejecutar_traduccion(entrada='quinua_simulada.csv', salida='quinua_simulada_es.csv', idioma='es',
+                        traduccion=TRADUCCION_QUINUA, tamano_bloque=500_000):
+    """Traduce el dataset e imprime el resumen y las primeras filas traducidas"""
+    inicio = time.perf_counter()
+    filas, primero = traducir_datos(entrada, salida, idioma, traduccion or TRADUCCION_QUINUA, tamano_bloque)
+    print(f"Archivo traducido guardado en: {salida}")
+    print(f"  {filas} filas, idioma '{idioma}', {time.perf_counter() - inicio:.1f} s")
+    if primero is not None:
+        print("\nPrimeras filas del dataset traducido:")
+        print(primero)
+    return filas
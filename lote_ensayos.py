@@ -0,0 +1,14 @@
+"""
+Análisis DBCA por lotes de ensayos (localidad × temporada)
+
+Equivale a `python -m dbca lote`; el código está en dbca.lote.
+Uso:
+    python lote_ensayos.py ensayos/ --salida resultados.parquet --procesos 8
+"""
+
+import sys
+
+from dbca.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main(['lote'] + sys.argv[1:]))
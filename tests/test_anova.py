@@ -0,0 +1,56 @@
+"""Regresiones del motor ANOVA (dbca.anova) contra mínimos cuadrados directos"""
+
+import os
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from dbca.anova import anova_dbca, nombre_termino
+from dbca.datos import leer_datos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FACTORES = ['Variedad', 'Fertilizante', 'Riego']
+
+
+def _anova_directa(df, respuesta, factores, bloque='Bloque'):
+    """SC y gl Tipo II comparando submodelos ajustados con lstsq sobre las N parcelas"""
+    y = df[respuesta].to_numpy(dtype=float)
+
+    def indicadoras(columnas):
+        grupo = df[list(columnas)].astype(str).agg('|'.join, axis=1)
+        return pd.get_dummies(grupo).to_numpy(dtype=float)
+
+    def ajustar(terminos):
+        X = np.hstack([np.ones((len(df), 1)), indicadoras([bloque])] + [indicadoras(t) for t in terminos])
+        beta = np.linalg.lstsq(X, y, rcond=None)[0]
+        residuo = y - X @ beta
+        return residuo @ residuo, np.linalg.matrix_rank(X)
+
+    todos = [t for k in range(1, len(factores) + 1) for t in combinations(factores, k)]
+    resultado = {}
+    for termino in todos:
+        base = [t for t in todos if not set(termino).issubset(t)]
+        (sc_base, rango_base), (sc_con, rango_con) = ajustar(base), ajustar(base + [termino])
+        resultado[nombre_termino(termino)] = (sc_base - sc_con, rango_con - rango_base)
+    sc_residual, rango = ajustar(todos)
+    resultado['Residual'] = (sc_residual, len(df) - rango)
+    return resultado
+
+
+def test_tratamiento_ausente_no_usa_forma_cerrada():
+    df, _ = leer_datos(os.path.join(RAIZ, 'quinua_5replicas.csv'), cache=False)
+    df = df[df['Tratamiento'] != 'A_Alto_Alto']
+    tabla = anova_dbca(df, 'Rendimiento_kg', FACTORES).tabla
+    for termino, (sc, gl) in _anova_directa(df, 'Rendimiento_kg', FACTORES).items():
+        assert tabla.loc[termino, 'df'] == gl
+        assert np.isclose(tabla.loc[termino, 'sum_sq'], sc)
+    assert tabla.loc['Residual', 'df'] == 42
+
+
+def test_filas_con_factor_faltante_se_descartan():
+    df = pd.read_csv(os.path.join(RAIZ, 'quinua_simulada.csv'))
+    assert df['Fertilizante'].isna().any()
+    tabla = anova_dbca(df, 'Rendimiento_kg', FACTORES).tabla
+    esperada = anova_dbca(df.dropna(subset=['Bloque'] + FACTORES), 'Rendimiento_kg', FACTORES).tabla
+    pd.testing.assert_frame_equal(tabla, esperada)
@@ -0,0 +1,32 @@
+"""Cache de disposiciones (dbca.cache) y factorizaciones acotadas de DisenoDBCA"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from dbca.anova import anova_dbca
+from dbca.cache import CacheDisenos
+from dbca.datos import leer_datos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FACTORES = ['Variedad', 'Fertilizante', 'Riego']
+
+
+def test_factorizaciones_acotadas_y_persistidas(tmp_path):
+    df, _ = leer_datos(os.path.join(RAIZ, 'quinua_5replicas.csv'), cache=False)
+    esperada = anova_dbca(df, 'Rendimiento_kg', FACTORES).tabla
+    cache = CacheDisenos(directorio=str(tmp_path))
+    rng = np.random.default_rng(0)
+    # Cada patrón de faltantes cambia n por celda y agrega factorizaciones al mismo diseño
+    for _ in range(40):
+        faltantes = df.copy()
+        faltantes.loc[rng.choice(len(df), 3, replace=False), 'Rendimiento_kg'] = np.nan
+        anova_dbca(faltantes, 'Rendimiento_kg', FACTORES, cache=cache)
+    diseno = next(iter(cache._entradas.values()))
+    assert cache.fallos == 1
+    assert len(diseno.factorizaciones) == diseno.max_factorizaciones
+
+    desde_disco = CacheDisenos(directorio=str(tmp_path))
+    pd.testing.assert_frame_equal(anova_dbca(df, 'Rendimiento_kg', FACTORES, cache=desde_disco).tabla, esperada)
+    assert desde_disco.aciertos == 1
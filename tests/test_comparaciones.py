@@ -0,0 +1,24 @@
+"""p-valores de Tukey interpolados (dbca.comparaciones) frente a la distribución exacta"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from dbca.anova import anova_dbca
+from dbca.comparaciones import P_MINIMA_TUKEY, comparaciones_multiples
+
+
+def test_media_extrema_no_altera_los_p_valores_de_los_demas():
+    rng = np.random.default_rng(0)
+    niveles = [f'T{i:02d}' for i in range(20)]
+    df = pd.DataFrame([(f'B{b}', t) for b in range(4) for t in niveles], columns=['Bloque', 'Tratamiento'])
+    # 19 medias cercanas y una muy alejada: q de 0 a ~6 y algunos pares con q ~ 200
+    df['y'] = rng.normal(0.0, 1.0, len(df)) + np.where(df['Tratamiento'] == 'T19', 200.0, 0.0)
+    modelo = anova_dbca(df, 'y', ['Tratamiento'])
+    pares = comparaciones_multiples(df, 'y', 'Tratamiento', modelo).pares
+
+    exacto = stats.studentized_range.sf(pares['estadistico'].to_numpy(), 20, modelo.gl_residual)
+    assert len(pares) == 190 and pares['estadistico'].max() > 100
+    cercanos = exacto >= P_MINIMA_TUKEY
+    np.testing.assert_allclose(pares['p_valor'].to_numpy()[cercanos], exacto[cercanos], atol=1e-4)
+    assert (pares['p_valor'].to_numpy()[~cercanos] <= P_MINIMA_TUKEY).all()
@@ -0,0 +1,55 @@
+"""Respuestas HTTP del servicio de paneles (dbca.servicio) ante archivos que no son datasets"""
+
+import json
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from dbca.figuras import usar_agg
+from dbca.servicio import ServidorPaneles, crear_manejador
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def url(tmp_path):
+    shutil.copy(f'{RAIZ}/quinua_simulada_es.csv', tmp_path / 'ensayo.csv')
+    (tmp_path / 'danado.parquet').write_bytes(b'esto no es un parquet')
+    texto = (tmp_path / 'ensayo.csv').read_text(encoding='utf-8').splitlines()
+    columna = texto[0].split(',').index('Rendimiento_kg')
+    filas = [texto[0]] + [','.join('alto' if j == columna else v for j, v in enumerate(fila.split(',')))
+                          for fila in texto[1:]]
+    (tmp_path / 'texto.csv').write_text('\n'.join(filas) + '\n', encoding='utf-8')
+
+    usar_agg()
+    http = ThreadingHTTPServer(('127.0.0.1', 0), crear_manejador(ServidorPaneles(str(tmp_path))))
+    hilo = threading.Thread(target=http.serve_forever, daemon=True)
+    hilo.start()
+    yield f'http://127.0.0.1:{http.server_address[1]}'
+    http.shutdown()
+    http.server_close()
+
+
+def _pedir(url):
+    try:
+        with urllib.request.urlopen(url, timeout=60) as respuesta:
+            return respuesta.status, respuesta.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read()
+
+
+@pytest.mark.parametrize('datos', ['danado.parquet', 'texto.csv'])
+def test_archivo_que_no_es_dataset_responde_400(url, datos):
+    codigo, contenido = _pedir(f'{url}/panel/bloque.png?datos={datos}')
+    assert codigo == 400
+    assert datos in json.loads(contenido)['error']
+
+
+def test_dataset_valido_responde_png(url):
+    codigo, contenido = _pedir(f'{url}/panel/bloque.png?datos=ensayo.csv')
+    assert codigo == 200 and contenido.startswith(b'\x89PNG')